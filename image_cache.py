@@ -0,0 +1,58 @@
+"""
+image_cache.py
+
+Кэш загруженных ресурсов:
+- картинки загружаются и convert_alpha()'ятся один раз на путь
+- звуки создаются один раз на путь
+
+Повторное создание Snake (рестарт игры) берёт готовые объекты из кэша
+вместо повторного чтения с диска и декодирования PNG/WAV.
+
+Важно: load() вызывать только после pygame.display.set_mode() (нужен для convert_alpha).
+"""
+
+import pygame
+
+
+_images = {}
+_sounds = {}
+
+
+def load(path: str):
+    """
+    Возвращает convert_alpha()-поверхность картинки из кэша (загружает при первом обращении).
+
+    Args:
+        path: Путь к файлу картинки.
+
+    Returns:
+        pygame.Surface: Общая для всех вызовов поверхность (не изменять).
+    """
+    surf = _images.get(path)
+    if surf is None:
+        surf = pygame.image.load(path).convert_alpha()
+        _images[path] = surf
+    return surf
+
+
+def load_sound(path: str):
+    """
+    Возвращает pygame.mixer.Sound из кэша (создаёт при первом обращении).
+
+    Args:
+        path: Путь к звуковому файлу.
+
+    Returns:
+        pygame.mixer.Sound: Общий для всех вызовов звук.
+    """
+    sound = _sounds.get(path)
+    if sound is None:
+        sound = pygame.mixer.Sound(path)
+        _sounds[path] = sound
+    return sound
+
+
+def clear() -> None:
+    """Сбрасывает кэш картинок и звуков (следующие load()/load_sound() загрузят заново)."""
+    _images.clear()
+    _sounds.clear()
@@ -5,19 +5,52 @@ main.py
 UI-слой игры:
 - Управляет окнами/состояниями (меню, настройки, игра, экран проигрыша)
 - Обрабатывает ввод (клавиатура/мышь)
-- Запускает тики обновления игры (таймер SCREEN_UPDATE)
+- Запускает тики обновления игры (накопитель времени кадров, шаг tick_ms)
 - Показывает статистику (предыдущий/лучший результат) и сохраняет её в SQLite через ScoreDB
 
 main.py импортирует snake_game.py и score_db.py.
 """
 
+import functools
 import pygame
 import sys
 
-from snake_game import SnakeGame
+from snake_game import SnakeGame, blit_batch
 from score_db import ScoreDB
 
 
+# Палитра UI (общие кортежи вместо литералов в каждом вызове отрисовки)
+_COL_BTN_FILL = (167, 209, 61)
+_COL_BTN_BORDER = (56, 74, 12)
+_FG_MENU = (56, 74, 12)
+_BG_MENU = (175, 215, 70)
+_BG_GAMEOVER = (150, 150, 150)
+_FG_GAMEOVER = (35, 35, 35)
+
+# Шрифты, доступные кэшированному рендеру текста: id(font) -> Font.
+# Шрифты живут всё время работы приложения, поэтому id не переиспользуется.
+_fonts_by_id = {}
+
+
+@functools.lru_cache(maxsize=256)
+def _render_text_cached(font_id: int, text: str, rgb: tuple) -> pygame.Surface:
+    """
+    Рендерит текст шрифтом из _fonts_by_id и кэширует готовую поверхность.
+
+    Статичные надписи рендерятся один раз, строки со счётом —
+    только когда меняется число.
+
+    Args:
+        font_id: id() зарегистрированного шрифта.
+        text: Текст надписи.
+        rgb: Цвет текста.
+
+    Returns:
+        pygame.Surface: Отрендеренный текст (не изменять — общий для всех вызовов).
+    """
+    return _fonts_by_id[font_id].render(text, True, rgb)
+
+
 class Button:
     """Простая UI-кнопка: рисование и проверка клика мышью."""
 
@@ -34,22 +67,52 @@ class Button:
         self._render()
 
     def _render(self) -> None:
-        """Создаёт текстовую поверхность для кнопки (кэш)."""
-        self.text_surf = self.font.render(self.text, True, (56, 74, 12))
+        """Создаёт текстовую поверхность для кнопки (кэш) и запекает кнопку."""
+        self.text_surf = self.font.render(self.text, True, _FG_MENU)
         self.text_rect = self.text_surf.get_rect(center=self.rect.center)
+        self.bake()
+
+    def bake(self) -> None:
+        """
+        Запекает кнопку целиком (фон + рамка + текст) в две поверхности:
+        обычную (_baked) и выделенную с толстой рамкой (_baked_selected).
+        """
+        self._baked = self._bake_surface(border_w=3)
+        self._baked_selected = self._bake_surface(border_w=5)
+
+    def _bake_surface(self, border_w: int):
+        """Рисует кнопку на отдельной прозрачной поверхности размера rect."""
+        surf = pygame.Surface(self.rect.size, pygame.SRCALPHA).convert_alpha()
+        local_rect = surf.get_rect()
+        pygame.draw.rect(surf, _COL_BTN_FILL, local_rect, border_radius=14)
+        pygame.draw.rect(surf, _COL_BTN_BORDER, local_rect, width=border_w, border_radius=14)
+        surf.blit(self.text_surf, self.text_surf.get_rect(center=local_rect.center))
+        return surf
 
     def draw(self, screen, selected: bool = False) -> None:
         """
-        Рисует кнопку.
+        Рисует кнопку (один blit запечённой поверхности).
 
         Args:
             screen: Экран pygame.
             selected: Подсветка (например выбранный размер поля).
         """
-        pygame.draw.rect(screen, (167, 209, 61), self.rect, border_radius=14)
-        border_w = 5 if selected else 3
-        pygame.draw.rect(screen, (56, 74, 12), self.rect, width=border_w, border_radius=14)
-        screen.blit(self.text_surf, self.text_rect)
+        screen.blit(self._baked_selected if selected else self._baked, self.rect.topleft)
+
+    def hit(self, pos) -> bool:
+        """
+        Проверяет, попадает ли точка в кнопку.
+
+        Тип события (ЛКМ) проверяет вызывающий код один раз на событие,
+        а не каждая кнопка отдельно.
+
+        Args:
+            pos: (x, y) координата клика.
+
+        Returns:
+            bool: True если pos внутри rect.
+        """
+        return self.rect.collidepoint(pos)
 
     def is_clicked(self, event) -> bool:
         """
@@ -64,7 +127,7 @@ class Button:
         return (
             event.type == pygame.MOUSEBUTTONDOWN
             and event.button == 1
-            and self.rect.collidepoint(event.pos)
+            and self.hit(event.pos)
         )
 
 
@@ -97,11 +160,25 @@ class GameApp:
         self.cell_number = 20
         self.fruits_count = 5
 
-        # Tick event: скорость "шага" змейки
-        self.SCREEN_UPDATE = pygame.USEREVENT
-        pygame.time.set_timer(self.SCREEN_UPDATE, 150)
+        # Скорость "шага" змейки: update() раз в tick_ms накопленного времени кадров
+        self.tick_ms = 150
+        self._tick_acc = 0
+
+        # Пропускаем в очередь только то, что реально обрабатывается
+        # (MOUSEMOTION и прочие события отсекаются ещё в SDL).
+        pygame.event.set_blocked(None)
+        pygame.event.set_allowed([
+            pygame.QUIT,
+            pygame.KEYDOWN,
+            pygame.MOUSEBUTTONDOWN,
+            pygame.VIDEOEXPOSE,
+            pygame.WINDOWEXPOSED,
+        ])
 
         self.clock = pygame.time.Clock()
+
+        # Статичные экраны (меню/настройки/проигрыш) перерисовываются только при _dirty
+        self._dirty = True
         self.state = self.STATE_MENU
 
         self.game = None
@@ -118,6 +195,9 @@ class GameApp:
         # Текущий результат (для экрана GAME_OVER)
         self.current_score = 0
 
+        # Кэш строк статистики экрана GAME_OVER: [(surface, rect), ...] или None
+        self._gameover_surfs = None
+
         # Защита от многократного сохранения game_over
         self._saved_game_over = False
 
@@ -126,6 +206,31 @@ class GameApp:
         self.pending_fruits_count = self.fruits_count
         self._sync_fruits_label()
 
+        # Диспетчеризация по состоянию: один поиск в dict вместо цепочки if/elif
+        self._event_handlers = {
+            self.STATE_MENU: self._handle_menu_event,
+            self.STATE_SETTINGS: self._handle_settings_event,
+            self.STATE_GAME: self.handle_game_input,
+            self.STATE_GAME_OVER: self._handle_game_over_event,
+        }
+        self._draw_handlers = {
+            self.STATE_MENU: self.draw_menu,
+            self.STATE_SETTINGS: self.draw_settings,
+            self.STATE_GAME: self.draw_game,
+            self.STATE_GAME_OVER: self.draw_game_over,
+        }
+
+    @property
+    def state(self) -> str:
+        """Текущее состояние приложения (одно из STATE_*)."""
+        return self._state
+
+    @state.setter
+    def state(self, value: str) -> None:
+        """Переключает состояние и помечает экран для перерисовки."""
+        self._state = value
+        self._dirty = True
+
     def apply_window(self) -> None:
         """Создаёт/пересоздаёт окно на основе cell_number и cell_size."""
         self.width = self.cell_number * self.cell_size
@@ -133,20 +238,63 @@ class GameApp:
         self.screen = pygame.display.set_mode((self.width, self.height))
         pygame.display.set_caption("Snake")
 
+        # Фоны экранов заливаются один раз; в draw_* — один blit вместо fill().
+        # Фон игры (трава) кэширует сам SnakeGame.
+        self._bg_menu = self._make_background(_BG_MENU)
+        self._bg_gameover = self._make_background(_BG_GAMEOVER)
+
+    def _make_background(self, color: tuple):
+        """Создаёт поверхность размером с окно, залитую цветом (в формате экрана)."""
+        surf = pygame.Surface((self.width, self.height)).convert()
+        surf.fill(color)
+        return surf
+
     def _load_assets(self) -> None:
         """Загружает ресурсы (картинки/шрифты) и собирает UI."""
-        self.apple = pygame.image.load("photos/apple.png").convert_alpha()
+        self._apple_raw = pygame.image.load("photos/apple.png")
+        self._scale_apple()
 
         # Оставляем "старое" решение со шрифтом (как просили)
         self.game_font = pygame.font.Font("font/arialmt.ttf", 25)
         self.title_font = pygame.font.Font("font/arialmt.ttf", 52)
+        _fonts_by_id[id(self.game_font)] = self.game_font
+        _fonts_by_id[id(self.title_font)] = self.title_font
 
         self._build_menu_ui()
         self._build_settings_ui()
         self._build_game_over_ui()
 
+    def _centered_text(self, font, text: str, color: tuple, dy: int) -> tuple:
+        """
+        Рендерит надпись (через кэш) и центрирует её по горизонтали.
+
+        Args:
+            font: Шрифт из _fonts_by_id.
+            text: Текст надписи.
+            color: Цвет текста.
+            dy: Смещение центра по вертикали относительно середины окна.
+
+        Returns:
+            tuple: (surface, rect), готовые для screen.blit(*...).
+        """
+        surf = _render_text_cached(id(font), text, color)
+        rect = surf.get_rect(center=(self.width // 2, self.height // 2 + dy))
+        return surf, rect
+
+    def _scale_apple(self) -> None:
+        """Готовит спрайт яблока ровно под cell_size (масштабируется один раз, а не при отрисовке)."""
+        apple = self._apple_raw
+        if apple.get_size() != (self.cell_size, self.cell_size):
+            apple = pygame.transform.smoothscale(apple, (self.cell_size, self.cell_size))
+        self.apple = apple.convert_alpha()
+
     def _build_menu_ui(self) -> None:
         """Создаёт кнопки и геометрию для экрана меню."""
+        self._menu_title = self._centered_text(self.title_font, "ЗМЕЙКА", _FG_MENU, -120)
+        self._menu_hint = self._centered_text(
+            self.game_font, "Enter = начать, Esc в игре -> меню", _FG_MENU, -60
+        )
+
         btn_w, btn_h = 280, 70
         btn_x = (self.width - btn_w) // 2
         start_y = (self.height // 2) + 10
@@ -154,8 +302,17 @@ class GameApp:
         self.start_button = Button((btn_x, start_y, btn_w, btn_h), "НАЧАТЬ", self.game_font)
         self.settings_button = Button((btn_x, start_y + 90, btn_w, btn_h), "НАСТРОЙКИ", self.game_font)
 
+        self._menu_blits = [
+            (btn._baked, btn.rect.topleft) for btn in (self.start_button, self.settings_button)
+        ]
+
     def _build_settings_ui(self) -> None:
         """Создаёт кнопки и геометрию для экрана настроек."""
+        self._settings_title = self._centered_text(self.title_font, "НАСТРОЙКИ", _FG_MENU, -170)
+        self._settings_subtitle = self._centered_text(
+            self.game_font, "Выбери размер поля и кол-во фруктов", _FG_MENU, -130
+        )
+
         btn_w, btn_h = 220, 60
         btn_x = (self.width - btn_w) // 2
         top_y = (self.height // 2) - 80
@@ -164,6 +321,11 @@ class GameApp:
         self.size_15_btn = Button((btn_x, top_y + 70, btn_w, btn_h), "15 x 15", self.game_font)
         self.size_20_btn = Button((btn_x, top_y + 140, btn_w, btn_h), "20 x 20", self.game_font)
 
+        # Кнопки размеров стоят столбиком с шагом 70: попадание считается арифметикой
+        # (x0, w, y0, h, шаг) вместо трёх collidepoint.
+        self._size_hit = (btn_x, btn_w, top_y, btn_h, 70)
+        self._size_values = (10, 15, 20)
+
         step_y = top_y + 220
         small_w = 70
         mid_w = 160
@@ -176,8 +338,15 @@ class GameApp:
         self.apply_btn = Button((btn_x, action_y, btn_w, btn_h), "ПРИНЯТЬ", self.game_font)
         self.back_btn = Button((btn_x, action_y + 80, btn_w, btn_h), "НАЗАД", self.game_font)
 
+        # Список blit'ов зависит от выбранного размера и подписи фруктов,
+        # пересобирается лениво в _settings_blits_for_pending().
+        self._settings_blits = []
+        self._settings_blits_key = None
+
     def _build_game_over_ui(self) -> None:
         """Создаёт кнопки и геометрию для экрана проигрыша (ПОТРАЧЕНО)."""
+        self._gameover_title = self._centered_text(self.title_font, "ПОТРАЧЕНО", _FG_GAMEOVER, -120)
+
         btn_w, btn_h = 280, 70
         btn_x = (self.width - btn_w) // 2
         y = (self.height // 2) + 30
@@ -185,6 +354,36 @@ class GameApp:
         self.go_restart_btn = Button((btn_x, y, btn_w, btn_h), "ЗАНОВО", self.game_font)
         self.go_menu_btn = Button((btn_x, y + 90, btn_w, btn_h), "МЕНЮ", self.game_font)
 
+        self._game_over_blits = [
+            (btn._baked, btn.rect.topleft) for btn in (self.go_restart_btn, self.go_menu_btn)
+        ]
+
+    def _settings_blits_for_pending(self) -> list:
+        """
+        Возвращает список blit'ов кнопок SETTINGS для текущих pending-значений.
+
+        Пересобирается только при смене выбранного размера поля или кол-ва фруктов.
+        """
+        key = (self.pending_cell_number, self.pending_fruits_count)
+        if key != self._settings_blits_key:
+            size_buttons = ((self.size_10_btn, 10), (self.size_15_btn, 15), (self.size_20_btn, 20))
+            self._settings_blits = [
+                (btn._baked_selected if self.pending_cell_number == size else btn._baked, btn.rect.topleft)
+                for btn, size in size_buttons
+            ]
+            self._settings_blits += [
+                (btn._baked, btn.rect.topleft)
+                for btn in (
+                    self.fruits_minus_btn,
+                    self.fruits_value_btn,
+                    self.fruits_plus_btn,
+                    self.apply_btn,
+                    self.back_btn,
+                )
+            ]
+            self._settings_blits_key = key
+        return self._settings_blits
+
     def _save_run_score(self, score: int) -> None:
         """
         Сохраняет результат завершённой игры в память и БД:
@@ -193,13 +392,17 @@ class GameApp:
         """
         score = int(score)
         self.current_score = score
+        self._gameover_surfs = None
+        self._dirty = True
 
         self.last_score = score
-        self.db.set("last_score", self.last_score)
+        items = [("last_score", score)]
 
         if score > self.best_score:
             self.best_score = score
-            self.db.set("best_score", self.best_score)
+            items.append(("best_score", score))
+
+        self.db.set_many(items)
 
     def _sync_fruits_label(self) -> None:
         """Обновляет текст на кнопке отображения количества фруктов (SETTINGS)."""
@@ -211,10 +414,34 @@ class GameApp:
         """Меняет pending кол-во фруктов в диапазоне 1..10."""
         self.pending_fruits_count = max(1, min(10, self.pending_fruits_count + delta))
         self._sync_fruits_label()
+        self._dirty = True
+
+    def _size_at(self, pos):
+        """
+        Определяет, на какую кнопку размера поля пришёлся клик (SETTINGS).
+
+        Args:
+            pos: (x, y) координата клика.
+
+        Returns:
+            int | None: Размер поля (10/15/20) или None, если мимо кнопок.
+        """
+        x0, w, y0, h, step = self._size_hit
+        dx = pos[0] - x0
+        row, off = divmod(pos[1] - y0, step)
+        if 0 <= dx < w and 0 <= row < len(self._size_values) and off < h:
+            return self._size_values[row]
+        return None
+
+    def _select_pending_size(self, cell_number: int) -> None:
+        """Выбирает pending размер поля (SETTINGS)."""
+        self.pending_cell_number = cell_number
+        self._dirty = True
 
     def start_game(self) -> None:
         """Запускает новую игру с текущими настройками (размер/фрукты)."""
         self._saved_game_over = False
+        self._tick_acc = 0
         self.game = SnakeGame(self.cell_number, fruits_count=self.fruits_count)
         self.game.reset()
         self.state = self.STATE_GAME
@@ -232,6 +459,9 @@ class GameApp:
         self.fruits_count = self.pending_fruits_count
 
         self.apply_window()
+        _render_text_cached.cache_clear()
+        self._gameover_surfs = None
+        self._scale_apple()
 
         # После смены размера окна — пересобираем UI
         self._build_menu_ui()
@@ -241,6 +471,73 @@ class GameApp:
 
         self.state = self.STATE_MENU
 
+    def _handle_menu_event(self, event) -> None:
+        """Обрабатывает событие в состоянии MENU (кнопки, Enter → игра)."""
+        if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            pos = event.pos
+            if self.start_button.hit(pos):
+                self.start_game()
+            elif self.settings_button.hit(pos):
+                self.open_settings()
+        elif event.type == pygame.KEYDOWN and event.key == pygame.K_RETURN:
+            self.start_game()
+
+    def _handle_settings_event(self, event) -> None:
+        """Обрабатывает событие в состоянии SETTINGS (размер, фрукты, принять/назад)."""
+        if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            pos = event.pos
+            size = self._size_at(pos)
+            if size is not None:
+                self._select_pending_size(size)
+            elif self.fruits_minus_btn.hit(pos):
+                self._change_pending_fruits(-1)
+            elif self.fruits_plus_btn.hit(pos):
+                self._change_pending_fruits(+1)
+            elif self.apply_btn.hit(pos):
+                self.apply_settings()
+            elif self.back_btn.hit(pos):
+                self.state = self.STATE_MENU
+        elif event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+            self.state = self.STATE_MENU
+
+    def _handle_game_over_event(self, event) -> None:
+        """Обрабатывает событие в состоянии GAME_OVER (заново/меню)."""
+        if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            pos = event.pos
+            if self.go_restart_btn.hit(pos):
+                self.start_game()
+            elif self.go_menu_btn.hit(pos):
+                self.state = self.STATE_MENU
+        elif event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_RETURN:
+                self.start_game()
+            elif event.key == pygame.K_ESCAPE:
+                self.state = self.STATE_MENU
+
+    def _update_game(self, dt: int) -> None:
+        """
+        Продвигает игру на прошедшее время кадра.
+
+        Делает столько тиков game.update(), сколько целых tick_ms накопилось,
+        но не больше двух за кадр: после долгой паузы кадра (перетаскивание
+        окна, сворачивание) змейка не делает рывок на десятки клеток.
+
+        Args:
+            dt: Время с прошлого кадра, мс (результат clock.tick).
+        """
+        self._tick_acc = min(self._tick_acc + dt, self.tick_ms * 2)
+        while self._tick_acc >= self.tick_ms:
+            self._tick_acc -= self.tick_ms
+            self.game.update()
+
+            # При проигрыше сохраняем результат ровно один раз.
+            if self.game.is_game_over():
+                if not self._saved_game_over:
+                    self._saved_game_over = True
+                    self._save_run_score(self.game.get_score())
+                self.state = self.STATE_GAME_OVER
+                return
+
     def handle_game_input(self, event) -> None:
         """Обрабатывает ввод в состоянии GAME (Esc → меню, стрелки → направление)."""
         if event.type != pygame.KEYDOWN:
@@ -254,15 +551,10 @@ class GameApp:
 
     def draw_menu(self) -> None:
         """Рисует экран меню."""
-        self.screen.fill((175, 215, 70))
-
-        title_surf = self.title_font.render("ЗМЕЙКА", True, (56, 74, 12))
-        title_rect = title_surf.get_rect(center=(self.width // 2, self.height // 2 - 120))
-        self.screen.blit(title_surf, title_rect)
+        self.screen.blit(self._bg_menu, (0, 0))
 
-        hint = self.game_font.render("Enter = начать, Esc в игре -> меню", True, (56, 74, 12))
-        hint_rect = hint.get_rect(center=(self.width // 2, self.height // 2 - 60))
-        self.screen.blit(hint, hint_rect)
+        self.screen.blit(*self._menu_title)
+        self.screen.blit(*self._menu_hint)
 
         # Если ты переносил статистику в меню — она обычно отрисовывается здесь.
         # stats = self.game_font.render(
@@ -272,139 +564,122 @@ class GameApp:
         # stats_rect = stats.get_rect(center=(self.width // 2, self.height // 2 - 20))
         # self.screen.blit(stats, stats_rect)
 
-        self.start_button.draw(self.screen)
-        self.settings_button.draw(self.screen)
+        blit_batch(self.screen, self._menu_blits)
 
     def draw_settings(self) -> None:
         """Рисует экран настроек."""
-        self.screen.fill((175, 215, 70))
-
-        title_surf = self.title_font.render("НАСТРОЙКИ", True, (56, 74, 12))
-        title_rect = title_surf.get_rect(center=(self.width // 2, self.height // 2 - 170))
-        self.screen.blit(title_surf, title_rect)
-
-        subtitle = self.game_font.render("Выбери размер поля и кол-во фруктов", True, (56, 74, 12))
-        subtitle_rect = subtitle.get_rect(center=(self.width // 2, self.height // 2 - 130))
-        self.screen.blit(subtitle, subtitle_rect)
+        self.screen.blit(self._bg_menu, (0, 0))
 
-        self.size_10_btn.draw(self.screen, selected=(self.pending_cell_number == 10))
-        self.size_15_btn.draw(self.screen, selected=(self.pending_cell_number == 15))
-        self.size_20_btn.draw(self.screen, selected=(self.pending_cell_number == 20))
+        self.screen.blit(*self._settings_title)
+        self.screen.blit(*self._settings_subtitle)
 
-        self.fruits_minus_btn.draw(self.screen)
-        self.fruits_value_btn.draw(self.screen)
-        self.fruits_plus_btn.draw(self.screen)
+        blit_batch(self.screen, self._settings_blits_for_pending())
 
-        self.apply_btn.draw(self.screen)
-        self.back_btn.draw(self.screen)
+    def draw_game(self):
+        """
+        Рисует игровой процесс (поле + змейка + фрукты + счёт).
 
-    def draw_game(self) -> None:
-        """Рисует игровой процесс (поле + змейка + фрукты + счёт)."""
-        self.screen.fill((175, 215, 70))
-        self.game.draw(self.screen, self.cell_size, self.apple, self.game_font)
+        Returns:
+            list | None: Изменённые области для display.update(),
+            или None, если кадр перерисован целиком.
+        """
+        if self._dirty:
+            self.game.invalidate()
+        return self.game.draw_dirty(self.screen, self.cell_size, self.apple, self.game_font)
 
     def draw_game_over(self) -> None:
         """Рисует экран проигрыша: серый фон, текст, статистика и кнопки."""
-        self.screen.fill((150, 150, 150))
+        self.screen.blit(self._bg_gameover, (0, 0))
+
+        self.screen.blit(*self._gameover_title)
+
+        # Строки статистики меняются только при сохранении результата,
+        # поэтому пересобираются лишь после сброса кэша.
+        if self._gameover_surfs is None:
+            self._gameover_surfs = self._build_gameover_surfs()
 
-        text_surf = self.title_font.render("ПОТРАЧЕНО", True, (35, 35, 35))
-        text_rect = text_surf.get_rect(center=(self.width // 2, self.height // 2 - 120))
-        self.screen.blit(text_surf, text_rect)
+        for surf, rect in self._gameover_surfs:
+            self.screen.blit(surf, rect)
 
-        score_line = self.game_font.render(f"Результат: {self.current_score}", True, (35, 35, 35))
-        best_line = self.game_font.render(f"Лучший: {self.best_score}", True, (35, 35, 35))
-        last_line = self.game_font.render(f"Предыдущий: {self.last_score}", True, (35, 35, 35))
+        blit_batch(self.screen, self._game_over_blits)
 
-        score_rect = score_line.get_rect(center=(self.width // 2, self.height // 2 - 70))
-        best_rect = best_line.get_rect(center=(self.width // 2, self.height // 2 - 40))
-        last_rect = last_line.get_rect(center=(self.width // 2, self.height // 2 - 10))
+    def _build_gameover_surfs(self) -> list:
+        """
+        Рендерит строки статистики для экрана GAME_OVER.
+
+        Returns:
+            list: [(surface, rect), ...] для результата, лучшего и предыдущего счёта.
+        """
+        lines = (
+            (f"Результат: {self.current_score}", -70),
+            (f"Лучший: {self.best_score}", -40),
+            (f"Предыдущий: {self.last_score}", -10),
+        )
+        return [self._centered_text(self.game_font, text, _FG_GAMEOVER, dy) for text, dy in lines]
 
-        self.screen.blit(score_line, score_rect)
-        self.screen.blit(best_line, best_rect)
-        self.screen.blit(last_line, last_rect)
+    def _pump_events(self) -> list:
+        """
+        Забирает накопившиеся события.
+
+        В GAME очередь опрашивается без блокировки (кадр и тики идут
+        непрерывно). На статичных экранах поток спит в event.wait()
+        до ввода или до следующего кадра.
+
+        Returns:
+            list: События pygame (без NOEVENT).
+        """
+        if self.state == self.STATE_GAME:
+            return pygame.event.get()
 
-        self.go_restart_btn.draw(self.screen)
-        self.go_menu_btn.draw(self.screen)
+        # _dirty здесь всегда сброшен прошлой отрисовкой: ждём кадр 30 FPS
+        first = pygame.event.wait(timeout=33)
+        events = [first] + pygame.event.get()
+        return [event for event in events if event.type != pygame.NOEVENT]
 
     def run(self) -> None:
         """
         Главный цикл приложения:
         - читает события
         - обрабатывает их согласно текущему state
-        - рисует соответствующий экран
+        - в GAME продвигает игру на время прошедшего кадра
+        - рисует соответствующий экран (статичные — только если что-то изменилось)
         """
+        dt = 0
         while True:
-            for event in pygame.event.get():
+            for event in self._pump_events():
                 if event.type == pygame.QUIT:
-                    pygame.quit()
-                    sys.exit()
-
-                if self.state == self.STATE_MENU:
-                    if self.start_button.is_clicked(event):
-                        self.start_game()
-                    if self.settings_button.is_clicked(event):
-                        self.open_settings()
-                    if event.type == pygame.KEYDOWN and event.key == pygame.K_RETURN:
-                        self.start_game()
-
-                elif self.state == self.STATE_SETTINGS:
-                    if self.size_10_btn.is_clicked(event):
-                        self.pending_cell_number = 10
-                    elif self.size_15_btn.is_clicked(event):
-                        self.pending_cell_number = 15
-                    elif self.size_20_btn.is_clicked(event):
-                        self.pending_cell_number = 20
-
-                    if self.fruits_minus_btn.is_clicked(event):
-                        self._change_pending_fruits(-1)
-                    elif self.fruits_plus_btn.is_clicked(event):
-                        self._change_pending_fruits(+1)
-
-                    if self.apply_btn.is_clicked(event):
-                        self.apply_settings()
-                    elif self.back_btn.is_clicked(event):
-                        self.state = self.STATE_MENU
-
-                    if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
-                        self.state = self.STATE_MENU
-
-                elif self.state == self.STATE_GAME:
-                    # Тик игры происходит на таймерном событии, а не каждый кадр.
-                    if event.type == self.SCREEN_UPDATE:
-                        self.game.update()
-
-                        # При проигрыше сохраняем результат ровно один раз.
-                        if self.game.is_game_over():
-                            if not self._saved_game_over:
-                                self._saved_game_over = True
-                                self._save_run_score(self.game.get_score())
-                            self.state = self.STATE_GAME_OVER
-
-                    self.handle_game_input(event)
-
-                elif self.state == self.STATE_GAME_OVER:
-                    if self.go_restart_btn.is_clicked(event):
-                        self.start_game()
-                    elif self.go_menu_btn.is_clicked(event):
-                        self.state = self.STATE_MENU
-
-                    if event.type == pygame.KEYDOWN:
-                        if event.key == pygame.K_RETURN:
-                            self.start_game()
-                        elif event.key == pygame.K_ESCAPE:
-                            self.state = self.STATE_MENU
-
-            if self.state == self.STATE_MENU:
-                self.draw_menu()
-            elif self.state == self.STATE_SETTINGS:
-                self.draw_settings()
-            elif self.state == self.STATE_GAME_OVER:
-                self.draw_game_over()
-            else:
-                self.draw_game()
-
-            pygame.display.update()
-            self.clock.tick(60)
+                    # close() пробрасывает ошибку фоновой записи результатов:
+                    # сообщаем о ней, но окно всё равно закрываем без трейсбека
+                    try:
+                        self.db.close()
+                    except Exception as exc:
+                        print(f"Не удалось сохранить результаты: {exc}", file=sys.stderr)
+                    finally:
+                        pygame.quit()
+                        sys.exit()
+
+                # Окно перекрыли/свернули — содержимое надо нарисовать заново
+                if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                    self._dirty = True
+
+                self._event_handlers[self.state](event)
+
+            if self.state == self.STATE_GAME:
+                self._update_game(dt)
+
+            # Игра анимируется каждый кадр; статичные экраны — только после изменений.
+            if self.state == self.STATE_GAME or self._dirty:
+                # Экраны меню перерисовываются целиком (None) — flip(); в игре
+                # draw_game возвращает лишь изменённые клетки — update(rects).
+                rects = self._draw_handlers[self.state]()
+                if rects is None:
+                    pygame.display.flip()
+                elif rects:
+                    pygame.display.update(rects)
+                self._dirty = False
+
+            # Шаг змейки задаёт tick_ms, а не FPS, поэтому вне игры хватает 30 кадров.
+            dt = self.clock.tick(60 if self.state == self.STATE_GAME else 30)
 
 
 if __name__ == "__main__":
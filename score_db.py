@@ -6,49 +6,217 @@ score_db.py
 Хранит:
 - last_score: результат последней завершённой игры
 - best_score: лучший результат за всё время
+
+Чтение идёт из кэша в памяти, запись в SQLite — в фоновом потоке,
+чтобы сохранение результата не подтормаживало игровой цикл.
+Незаписанные значения дописываются при close(), в том числе автоматически
+при выходе интерпретатора (atexit).
 """
 
+import atexit
+import queue
 import sqlite3
+import threading
+
+# Элемент очереди записи: удалить все значения (см. ScoreDB.clear)
+_CLEAR = object()
+
+# SQL собран один раз: одинаковые строки попадают в кэш подготовленных запросов sqlite3
+_SQL_CREATE = (
+    "CREATE TABLE IF NOT EXISTS stats ("
+    "key TEXT PRIMARY KEY, "
+    "value INTEGER NOT NULL)"
+)
+_SQL_SELECT_ALL = "SELECT key, value FROM stats"
+_SQL_UPSERT = (
+    "INSERT INTO stats(key, value) VALUES(?, ?) "
+    "ON CONFLICT(key) DO UPDATE SET value=excluded.value"
+)
+_SQL_DELETE_ALL = "DELETE FROM stats"
+_PRAGMAS = ("PRAGMA journal_mode=WAL", "PRAGMA synchronous=NORMAL")
+# Режим fast (тесты): без fsync и журнала на диске, файл занят одним соединением
+_FAST_PRAGMAS = (
+    "PRAGMA journal_mode=MEMORY",
+    "PRAGMA synchronous=OFF",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA locking_mode=EXCLUSIVE",
+)
 
 
 class ScoreDB:
     """Обёртка над SQLite для чтения/записи пар 'ключ-значение' (int)."""
 
-    def __init__(self, path: str = "scores.db"):
+    def __init__(self, path: str = "scores.db", *, fast: bool = False):
         """
         Создаёт экземпляр БД и инициализирует таблицы при необходимости.
 
+        Соединение открывается один раз (autocommit, WAL). После чтения таблицы
+        в кэш им владеет фоновый поток-писатель. Закрывается через close()
+        (если его не вызвали — при выходе интерпретатора).
+
+        Args:
+            path: Путь к файлу БД (или ":memory:").
+            fast: Только для тестов — журнал в памяти, без fsync и с эксклюзивной
+                блокировкой файла; при сбое данные могут потеряться.
         """
         self.path = path
+        self._con = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        for pragma in _FAST_PRAGMAS if fast else _PRAGMAS:
+            self._con.execute(pragma)
         self._init()
 
+        rows = self._con.execute(_SQL_SELECT_ALL).fetchall()
+        self._cache = {key: int(value) for key, value in rows}
+
+        # Очередь пачек [(key, value), ...] на запись; _CLEAR — очистка, None — сигнал остановки
+        self._q = queue.Queue()
+        # Первая ошибка записи из фонового потока; пробрасывается из flush()/close()
+        self._error = None
+        self._thread = threading.Thread(target=self._writer, name="ScoreDB-writer", daemon=True)
+        self._thread.start()
+
+        self._closed = False
+        atexit.register(self.close)
+
     def _init(self) -> None:
         """Создаёт таблицу stats, если она ещё не существует."""
-        with sqlite3.connect(self.path) as con:
-            con.execute(
-                "CREATE TABLE IF NOT EXISTS stats ("
-                "key TEXT PRIMARY KEY, "
-                "value INTEGER NOT NULL)"
-            )
-            con.commit()
+        self._con.execute(_SQL_CREATE)
+
+    def _writer(self) -> None:
+        """
+        Цикл фонового потока: пишет пачки из очереди, пока не придёт None.
+
+        Всё, что накопилось в очереди к моменту пробуждения, применяется
+        одной транзакцией (в порядке постановки), а не транзакцией на каждый set().
+        Ошибка записи не останавливает поток: пачка откатывается, ошибка
+        сохраняется для flush()/close(), следующие пачки пишутся как обычно.
+        """
+        while True:
+            batch = [self._q.get()]
+            while True:
+                try:
+                    batch.append(self._q.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = None in batch
+            try:
+                ops = batch[:batch.index(None)] if stop else batch
+                if ops:
+                    self._write_batch(ops)
+            except Exception as exc:
+                if self._error is None:
+                    self._error = exc
+            finally:
+                for _ in batch:
+                    self._q.task_done()
+            if stop:
+                return
+
+    def _write_batch(self, ops) -> None:
+        """
+        Пишет накопившиеся операции одной транзакцией.
+
+        Если общая транзакция откатилась, операции повторяются по одной, каждая
+        в своей транзакции: теряется только ошибочная, а не соседние записи
+        из той же пачки. Пробрасывает первую ошибку повтора.
+        """
+        try:
+            self._write_ops(ops)
+        except Exception:
+            if len(ops) == 1:
+                raise
+            error = None
+            for op in ops:
+                try:
+                    self._write_ops([op])
+                except Exception as exc:
+                    if error is None:
+                        error = exc
+            if error is not None:
+                raise error
+
+    def _write_ops(self, ops) -> None:
+        """Применяет операции из очереди (пачки upsert и _CLEAR) одной транзакцией."""
+        self._con.execute("BEGIN")
+        try:
+            for op in ops:
+                if op is _CLEAR:
+                    self._con.execute(_SQL_DELETE_ALL)
+                else:
+                    self._con.executemany(_SQL_UPSERT, op)
+            self._con.execute("COMMIT")
+        except Exception:
+            # SQLite мог уже откатить транзакцию сам (например, при нехватке места);
+            # после неудачного COMMIT она ещё открыта и без отката заблокирует следующий BEGIN
+            if self._con.in_transaction:
+                self._con.execute("ROLLBACK")
+            raise
 
     def get(self, key: str, default: int = 0) -> int:
         """
         Возвращает значение по ключу.
         """
-        with sqlite3.connect(self.path) as con:
-            cur = con.execute("SELECT value FROM stats WHERE key = ?", (key,))
-            row = cur.fetchone()
-            return int(row[0]) if row is not None else int(default)
+        return self._cache.get(key, int(default))
 
     def set(self, key: str, value: int) -> None:
         """
-        Записывает значение по ключу.
+        Записывает значение по ключу (в кэш сразу, в файл — в фоне).
+        """
+        self.set_many([(key, value)])
+
+    def set_many(self, items) -> None:
+        """
+        Записывает несколько пар 'ключ-значение' одной транзакцией.
+
+        Args:
+            items: Итерируемое из пар (key, value) или словарь {key: value}.
+        """
+        if hasattr(items, "items"):
+            items = items.items()
+        rows = [(key, int(value)) for key, value in items]
+        if not rows:
+            return
+        self._cache.update(rows)
+        self._q.put(rows)
+
+    def clear(self) -> None:
+        """
+        Удаляет все значения (в кэше сразу, в файле — в фоне, после уже поставленных записей).
+        """
+        self._cache.clear()
+        self._q.put(_CLEAR)
+
+    def flush(self) -> None:
+        """
+        Блокирует до тех пор, пока все поставленные значения не записаны в файл.
+
+        Raises:
+            Exception: Ошибка записи из фонового потока (если была с прошлого
+                flush()/close()); пачка с ошибкой в файл не попала.
+        """
+        if self._thread.is_alive():
+            self._q.join()
+        self._raise_write_error()
+
+    def _raise_write_error(self) -> None:
+        """Пробрасывает (один раз) сохранённую ошибку фонового потока."""
+        error, self._error = self._error, None
+        if error is not None:
+            raise error
+
+    def close(self) -> None:
+        """
+        Дожидается записи всех поставленных значений и закрывает соединение с БД.
+
+        Повторный вызов ничего не делает. Ошибка записи из фонового потока
+        пробрасывается после закрытия соединения (как в flush()).
         """
-        with sqlite3.connect(self.path) as con:
-            con.execute(
-                "INSERT INTO stats(key, value) VALUES(?, ?) "
-                "ON CONFLICT(key) DO UPDATE SET value=excluded.value",
-                (key, int(value)),
-            )
-            con.commit()
+        if self._closed:
+            return
+        self._closed = True
+        atexit.unregister(self.close)
+        self._q.put(None)
+        self._thread.join()
+        self._con.close()
+        self._raise_write_error()
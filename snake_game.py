@@ -1,363 +1,699 @@
-"""
-snake_game.py
-
-Игровая логика "Змейки" (без UI экранов):
-- Модель змейки (координаты в клетках, движение, рост, спрайты)
-- Модель фруктов (несколько яблок одновременно)
-- Проверка столкновений (стены / сам в себя)
-- Подсчёт очков и флаг game_over
-
-"""
-
-
-import random
-import pygame
-from pygame.math import Vector2
-from typing import Set, Tuple
-
-
-class Snake:
-    """Модель змейки: тело, направление, рост и отрисовка спрайтов."""
-
-    def __init__(self):
-        """Инициализирует змейку, загружает спрайты и звук."""
-
-        self.body = [Vector2(5, 10), Vector2(4, 10), Vector2(3, 10)]
-        self.direction = Vector2(0, 0)
-        self.new_block = False
-
-        # Graphics
-        self.head_up = pygame.image.load('photos/head_up.png').convert_alpha()
-        self.head_down = pygame.image.load('photos/head_down.png').convert_alpha()
-        self.head_right = pygame.image.load('photos/head_right.png').convert_alpha()
-        self.head_left = pygame.image.load('photos/head_left.png').convert_alpha()
-
-        self.tail_up = pygame.image.load('photos/tail_up.png').convert_alpha()
-        self.tail_down = pygame.image.load('photos/tail_down.png').convert_alpha()
-        self.tail_right = pygame.image.load('photos/tail_right.png').convert_alpha()
-        self.tail_left = pygame.image.load('photos/tail_left.png').convert_alpha()
-
-        self.body_vertical = pygame.image.load('photos/body_vertical.png').convert_alpha()
-        self.body_horizontal = pygame.image.load('photos/body_horizontal.png').convert_alpha()
-
-        self.body_tr = pygame.image.load('photos/body_tr.png').convert_alpha()
-        self.body_tl = pygame.image.load('photos/body_tl.png').convert_alpha()
-        self.body_br = pygame.image.load('photos/body_br.png').convert_alpha()
-        self.body_bl = pygame.image.load('photos/body_bl.png').convert_alpha()
-
-        # Sound
-        self.crunch_sound = pygame.mixer.Sound('Sound/nyam.wav')
-
-        # Defaults
-        self.head = self.head_right
-        self.tail = self.tail_left
-
-    def reset(self):
-        """Сбрасывает змейку в стартовое состояние (позиция/направление/рост)."""
-
-        self.body = [Vector2(5, 10), Vector2(4, 10), Vector2(3, 10)]
-        self.direction = Vector2(0, 0)
-        self.new_block = False
-
-    def play_crunch_sound(self):
-        """Проигрывает звук поедания."""
-
-        self.crunch_sound.play()
-
-    def add_block(self):
-        """Помечает, что на следующем шаге змейка должна вырасти на 1 сегмент."""
-
-        self.new_block = True
-
-    def move(self):
-        """
-            Делает один шаг змейки по сетке.
-
-            Механика:
-            - Создаётся новая голова: old_head + direction
-            - Вставляется в начало списка body
-            - Если не растём — удаляется хвост
-            - Если direction=(0,0) — змейка стоит (до первого нажатия)
-        """
-        # Important: do not move until player chooses direction
-        if self.direction == Vector2(0, 0):
-            return
-
-        if self.new_block:
-            body_copy = self.body[:]
-            body_copy.insert(0, body_copy[0] + self.direction)
-            self.body = body_copy
-            self.new_block = False
-        else:
-            body_copy = self.body[:-1]
-            body_copy.insert(0, body_copy[0] + self.direction)
-            self.body = body_copy
-
-    def draw(self, screen, cell_size):
-        """
-            Рисует змейку на экране по текущим координатам.
-        """
-
-        self._update_head_graphics()
-        self._update_tail_graphics()
-
-        for index, block in enumerate(self.body):
-            x_pos = int(block.x * cell_size)
-            y_pos = int(block.y * cell_size)
-            block_rect = pygame.Rect(x_pos, y_pos, cell_size, cell_size)
-
-            if index == 0:
-                screen.blit(self.head, block_rect)
-            elif index == len(self.body) - 1:
-                screen.blit(self.tail, block_rect)
-            else:
-                previous_block = self.body[index + 1] - block
-                next_block = self.body[index - 1] - block
-                if previous_block.x == next_block.x:
-                    screen.blit(self.body_vertical, block_rect)
-                elif previous_block.y == next_block.y:
-                    screen.blit(self.body_horizontal, block_rect)
-                else:
-                    if (previous_block.x == -1 and next_block.y == -1) or (previous_block.y == -1 and next_block.x == -1):
-                        screen.blit(self.body_tl, block_rect)
-                    elif (previous_block.x == -1 and next_block.y == 1) or (previous_block.y == 1 and next_block.x == -1):
-                        screen.blit(self.body_bl, block_rect)
-                    elif (previous_block.x == 1 and next_block.y == -1) or (previous_block.y == -1 and next_block.x == 1):
-                        screen.blit(self.body_tr, block_rect)
-                    elif (previous_block.x == 1 and next_block.y == 1) or (previous_block.y == 1 and next_block.x == 1):
-                        screen.blit(self.body_br, block_rect)
-
-    def _update_head_graphics(self):
-        """Выбирает правильный спрайт головы по направлению движения."""
-
-        head_relation = self.body[1] - self.body[0]
-        if head_relation == Vector2(1, 0):
-            self.head = self.head_left
-        elif head_relation == Vector2(-1, 0):
-            self.head = self.head_right
-        elif head_relation == Vector2(0, 1):
-            self.head = self.head_up
-        elif head_relation == Vector2(0, -1):
-            self.head = self.head_down
-
-    def _update_tail_graphics(self):
-        """Выбирает правильный спрайт хвоста по направлению последнего сегмента."""
-
-        tail_relation = self.body[-2] - self.body[-1]
-        if tail_relation == Vector2(1, 0):
-            self.tail = self.tail_left
-        elif tail_relation == Vector2(-1, 0):
-            self.tail = self.tail_right
-        elif tail_relation == Vector2(0, 1):
-            self.tail = self.tail_up
-        elif tail_relation == Vector2(0, -1):
-            self.tail = self.tail_down
-
-
-class Fruit:
-    """Один фрукт (яблоко) с позицией в координатах клеток."""
-
-    def __init__(self, cell_number: int):
-        self.cell_number = cell_number
-        self.pos = Vector2(0, 0)
-
-    def spawn(self, occupied: Set[Tuple[int, int]]):
-        """
-            Ставит фрукт в случайную свободную клетку.
-        """
-        max_attempts = self.cell_number * self.cell_number + 200
-        for _ in range(max_attempts):
-            x = random.randint(0, self.cell_number - 1)
-            y = random.randint(0, self.cell_number - 1)
-            if (x, y) not in occupied:
-                self.pos = Vector2(x, y)
-                return
-
-    def draw(self, screen, cell_size, apple_surface):
-        """
-            Рисует фрукт.
-        """
-        rect = pygame.Rect(int(self.pos.x * cell_size), int(self.pos.y * cell_size), cell_size, cell_size)
-        screen.blit(apple_surface, rect)
-
-
-class SnakeGame:
-    """
-    Основной класс игровой логики.
-    """
-    def __init__(self, cell_number: int, fruits_count: int = 5):
-        self.cell_number = cell_number
-        self.fruits_count = max(1, int(fruits_count))
-
-        self.snake = Snake()
-        self.fruits = []
-        self.pending_spawns = 0
-        self.game_over = False
-
-        self._spawn_initial_fruits()
-
-    def reset(self):
-        """Полный сброс игрового состояния (змейка/фрукты/очки/game_over)."""
-
-        self.snake.reset()
-        self.fruits.clear()
-        self.pending_spawns = 0
-        self.game_over = False
-        self._spawn_initial_fruits()
-
-    def is_game_over(self) -> bool:
-        """Возвращает True, если игра завершена (столкновение)."""
-
-        return self.game_over
-
-    def get_score(self) -> int:
-        """Возвращает текущий счёт: длина змейки минус стартовая длина (3)."""
-
-        return max(0, len(self.snake.body) - 3)
-
-    def update(self):
-        """
-            Один тик игры (вызывается таймером в main.py).
-            Порядок:
-            - движение
-            - поедание
-            - проверка проигрыша
-            - дозаспавн фруктов (не более 1 за тик)
-        """
-        if self.game_over:
-            return
-
-        self.snake.move()
-        self._check_eat()
-        self._check_fail()
-        self._process_pending_spawns(max_per_update=1)
-
-    def handle_key(self, key):
-        """
-            Обрабатывает направление движения по нажатой клавише.
-
-        """
-        if self.game_over:
-            return
-
-        if key == pygame.K_UP and self.snake.direction.y != 1:
-            self.snake.direction = Vector2(0, -1)
-        elif key == pygame.K_RIGHT and self.snake.direction.x != -1:
-            self.snake.direction = Vector2(1, 0)
-        elif key == pygame.K_DOWN and self.snake.direction.y != -1:
-            self.snake.direction = Vector2(0, 1)
-        elif key == pygame.K_LEFT and self.snake.direction.x != 1:
-            self.snake.direction = Vector2(-1, 0)
-
-    def draw(self, screen, cell_size, apple_surface, game_font):
-        self._draw_grass(screen, cell_size)
-
-        for fruit in self.fruits:
-            fruit.draw(screen, cell_size, apple_surface)
-
-        self.snake.draw(screen, cell_size)
-        self._draw_score(screen, cell_size, apple_surface, game_font)
-
-    # ---- fruits ----
-
-    def _occupied_cells(self) -> Set[Tuple[int, int]]:
-        """Возвращает множество занятых клеток (змейка + фрукты)."""
-
-        occupied: Set[Tuple[int, int]] = set()
-        for block in self.snake.body:
-            occupied.add((int(block.x), int(block.y)))
-        for fruit in self.fruits:
-            occupied.add((int(fruit.pos.x), int(fruit.pos.y)))
-        return occupied
-
-    def _spawn_initial_fruits(self):
-        """Спавнит стартовое количество фруктов (fruits_count)."""
-
-        for _ in range(self.fruits_count):
-            self._spawn_one_fruit()
-
-    def _spawn_one_fruit(self):
-        """Создаёт 1 фрукт и ставит его в свободную клетку."""
-
-        fruit = Fruit(self.cell_number)
-        fruit.spawn(self._occupied_cells())
-        self.fruits.append(fruit)
-
-    def _check_eat(self):
-        """
-                Проверяет поедание фруктов:
-                - если голова на фрукте: удалить фрукт, вырастить змейку, запланировать новый фрукт.
-        """
-        head = self.snake.body[0]
-
-        eaten_index = None
-        for i, fruit in enumerate(self.fruits):
-            if fruit.pos == head:
-                eaten_index = i
-                break
-
-        if eaten_index is not None:
-            self.fruits.pop(eaten_index)
-            self.snake.add_block()
-            self.snake.play_crunch_sound()
-            self.pending_spawns += 1
-
-    def _process_pending_spawns(self, max_per_update: int = 1):
-        if self.pending_spawns <= 0:
-            return
-
-        created = 0
-        while (
-            created < max_per_update
-            and self.pending_spawns > 0
-            and len(self.fruits) < self.fruits_count
-        ):
-            self._spawn_one_fruit()
-            self.pending_spawns -= 1
-            created += 1
-
-        if len(self.fruits) >= self.fruits_count:
-            self.pending_spawns = 0
-
-    # ---- fail ----
-
-    def _check_fail(self):
-        head = self.snake.body[0]
-
-        if not (0 <= head.x < self.cell_number and 0 <= head.y < self.cell_number):
-            self.game_over = True
-            return
-
-        for block in self.snake.body[1:]:
-            if block == head:
-                self.game_over = True
-                return
-
-    # ---- draw helpers ----
-
-    def _draw_grass(self, screen, cell_size):
-        grass_color = (167, 209, 61)
-        for row in range(self.cell_number):
-            for col in range(self.cell_number):
-                if (row + col) % 2 == 0:
-                    rect = pygame.Rect(col * cell_size, row * cell_size, cell_size, cell_size)
-                    pygame.draw.rect(screen, grass_color, rect)
-
-    def _draw_score(self, screen, cell_size, apple_surface, game_font):
-        score_text = str(self.get_score())
-        score_surface = game_font.render(score_text, True, (56, 74, 12))
-        score_x = int(cell_size * self.cell_number - 60)
-        score_y = int(cell_size * self.cell_number - 40)
-        score_rect = score_surface.get_rect(center=(score_x, score_y))
-        apple_rect = apple_surface.get_rect(midright=(score_rect.left, score_rect.centery))
-        bg_rect = pygame.Rect(
-            apple_rect.left,
-            apple_rect.top,
-            apple_rect.width + score_rect.width + 6,
-            apple_rect.height
-        )
-
-        pygame.draw.rect(screen, (167, 209, 61), bg_rect)
-        screen.blit(score_surface, score_rect)
-        screen.blit(apple_surface, apple_rect)
-        pygame.draw.rect(screen, (56, 74, 12), bg_rect, 2)
+"""
+snake_game.py
+
+Игровая логика "Змейки" (без UI экранов):
+- Модель змейки (координаты в клетках, движение, рост, спрайты)
+- Модель фруктов (несколько яблок одновременно)
+- Проверка столкновений (стены / сам в себя)
+- Подсчёт очков и флаг game_over
+
+"""
+
+
+import random
+import pygame
+from array import array
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import image_cache
+
+
+def blit_batch(screen, blit_seq):
+    """
+    Рисует список (surface, dest) одним вызовом.
+
+    fblits (pygame-ce) быстрее, в обычном pygame используется blits без возврата rect'ов.
+    """
+    if hasattr(screen, "fblits"):
+        screen.fblits(blit_seq)
+    else:
+        screen.blits(blit_seq, doreturn=False)
+
+
+# Стартовое тело змейки: клетки (x, y) от головы к хвосту
+START_BODY = ((5, 10), (4, 10), (3, 10))
+
+
+def _grass_tiles(cell_number, cell_size):
+    """Кортеж клеток (x, y, w, h) светлой травы шахматки: клетки с чётной суммой row + col."""
+
+    return tuple(
+        (col * cell_size, row * cell_size, cell_size, cell_size)
+        for row in range(cell_number)
+        for col in range(row % 2, cell_number, 2)
+    )
+
+
+class Snake:
+    """
+    Модель змейки: тело, направление, рост и отрисовка спрайтов.
+
+    Тело хранится как две параллельные очереди целых координат клеток
+    (xs[i], ys[i]) — от головы к хвосту. Голова добавляется appendleft,
+    хвост снимается pop — оба за O(1), без объектов Vector2.
+    Множество cells дублирует клетки тела для O(1) проверки самопересечения.
+    """
+
+    __slots__ = (
+        'xs', 'ys', 'cells', 'hit_self', 'direction', 'new_block',
+        'head_up', 'head_down', 'head_right', 'head_left',
+        'tail_up', 'tail_down', 'tail_right', 'tail_left',
+        'body_vertical', 'body_horizontal',
+        'body_tr', 'body_tl', 'body_br', 'body_bl',
+        '_head_by_delta', '_tail_by_delta', '_body_by_deltas',
+        'crunch_sound', 'head', 'tail',
+        '_draw_cache', '_draw_cache_size',
+    )
+
+    def __init__(self):
+        """Инициализирует змейку, берёт спрайты и звук из image_cache."""
+
+        self.body = START_BODY
+        self.direction = (0, 0)
+        self.new_block = False
+
+        # Graphics
+        self.head_up = image_cache.load('photos/head_up.png')
+        self.head_down = image_cache.load('photos/head_down.png')
+        self.head_right = image_cache.load('photos/head_right.png')
+        self.head_left = image_cache.load('photos/head_left.png')
+
+        self.tail_up = image_cache.load('photos/tail_up.png')
+        self.tail_down = image_cache.load('photos/tail_down.png')
+        self.tail_right = image_cache.load('photos/tail_right.png')
+        self.tail_left = image_cache.load('photos/tail_left.png')
+
+        self.body_vertical = image_cache.load('photos/body_vertical.png')
+        self.body_horizontal = image_cache.load('photos/body_horizontal.png')
+
+        self.body_tr = image_cache.load('photos/body_tr.png')
+        self.body_tl = image_cache.load('photos/body_tl.png')
+        self.body_br = image_cache.load('photos/body_br.png')
+        self.body_bl = image_cache.load('photos/body_bl.png')
+
+        # Спрайт головы/хвоста по смещению (dx, dy) соседнего сегмента
+        self._head_by_delta = {
+            (1, 0): self.head_left,
+            (-1, 0): self.head_right,
+            (0, 1): self.head_up,
+            (0, -1): self.head_down,
+        }
+        self._tail_by_delta = {
+            (1, 0): self.tail_left,
+            (-1, 0): self.tail_right,
+            (0, 1): self.tail_up,
+            (0, -1): self.tail_down,
+        }
+
+        # Спрайт среднего сегмента по смещениям (pdx, pdy, ndx, ndy)
+        # к предыдущему (ближе к хвосту) и следующему (ближе к голове) сегментам
+        self._body_by_deltas = {}
+        for sprite, (a, b) in (
+            (self.body_vertical, ((0, -1), (0, 1))),
+            (self.body_horizontal, ((-1, 0), (1, 0))),
+            (self.body_tl, ((-1, 0), (0, -1))),
+            (self.body_bl, ((-1, 0), (0, 1))),
+            (self.body_tr, ((1, 0), (0, -1))),
+            (self.body_br, ((1, 0), (0, 1))),
+        ):
+            self._body_by_deltas[a + b] = sprite
+            self._body_by_deltas[b + a] = sprite
+
+        # Sound
+        self.crunch_sound = image_cache.load_sound('Sound/nyam.wav')
+
+        # Defaults
+        self.head = self.head_right
+        self.tail = self.tail_left
+
+    @property
+    def body(self) -> List[Tuple[int, int]]:
+        """Клетки тела [(x, y), ...] от головы к хвосту (снимок; изменения не влияют на змейку)."""
+        return list(zip(self.xs, self.ys))
+
+    @body.setter
+    def body(self, cells: Iterable[Tuple[int, int]]):
+        """Задаёт тело по списку клеток (x, y) от головы к хвосту."""
+        cells = [(int(x), int(y)) for x, y in cells]
+        self.xs = deque(x for x, _ in cells)
+        self.ys = deque(y for _, y in cells)
+        self.cells: Set[Tuple[int, int]] = set(cells)
+        self.hit_self = False
+        self._draw_cache = None
+        self._draw_cache_size = None
+
+    def head_cell(self) -> Tuple[int, int]:
+        """Возвращает клетку головы (x, y)."""
+        return self.xs[0], self.ys[0]
+
+    def reset(self):
+        """Сбрасывает змейку в стартовое состояние (позиция/направление/рост)."""
+
+        self.body = START_BODY
+        self.direction = (0, 0)
+        self.new_block = False
+
+    def play_crunch_sound(self):
+        """Проигрывает звук поедания."""
+
+        self.crunch_sound.play()
+
+    def add_block(self):
+        """Помечает, что на следующем шаге змейка должна вырасти на 1 сегмент."""
+
+        self.new_block = True
+
+    def move(self):
+        """
+            Делает один шаг змейки по сетке.
+
+            Механика:
+            - Новая голова: old_head + direction, добавляется в начало xs/ys
+            - Если не растём — удаляется хвост (до проверки головы: в только что
+              освобождённую клетку хвоста шагать можно)
+            - hit_self = True, если новая голова попала в клетку тела
+            - Если direction=(0,0) — змейка стоит (до первого нажатия)
+
+            Returns:
+                (added, removed): клетка новой головы и освобождённая клетка хвоста
+                (None, если змейка выросла); None, если змейка не двигалась.
+        """
+        dx, dy = self.direction
+        # Important: do not move until player chooses direction
+        if dx == 0 and dy == 0:
+            return None
+
+        head = (self.xs[0] + dx, self.ys[0] + dy)
+        if self.new_block:
+            self.new_block = False
+            removed = None
+        else:
+            removed = (self.xs.pop(), self.ys.pop())
+            self.cells.discard(removed)
+
+        self.hit_self = head in self.cells
+        self.xs.appendleft(head[0])
+        self.ys.appendleft(head[1])
+        self.cells.add(head)
+        self._draw_cache = None
+        return head, removed
+
+    def draw(self, screen, cell_size):
+        """
+            Рисует змейку на экране по текущим координатам.
+
+            Спрайты всех сегментов собираются в список и выводятся одним blit_batch.
+            Список кэшируется до следующего шага змейки (или смены cell_size):
+            пока змейка стоит, кадр — это один blit_batch без выбора спрайтов.
+        """
+        if self._draw_cache is None or self._draw_cache_size != cell_size:
+            self._draw_cache = self._build_blit_seq(cell_size)
+            self._draw_cache_size = cell_size
+
+        blit_batch(screen, self._draw_cache)
+
+    def _build_blit_seq(self, cell_size):
+        """Собирает [(sprite, (x, y)), ...] для всех сегментов от головы к хвосту."""
+
+        self._update_head_graphics()
+        self._update_tail_graphics()
+
+        # Снимок клеток в список; инварианты цикла — в локальных переменных
+        cells = self.body
+        cs = cell_size
+        sprite_for = self._body_by_deltas.get
+
+        head_x, head_y = cells[0]
+        blit_seq = [(self.head, (head_x * cs, head_y * cs))]
+        append = blit_seq.append
+
+        # Средние сегменты: тройки (следующий, текущий, предыдущий) от головы к хвосту
+        for (next_x, next_y), (x, y), (prev_x, prev_y) in zip(cells, cells[1:], cells[2:]):
+            sprite = sprite_for((prev_x - x, prev_y - y, next_x - x, next_y - y))
+            if sprite is not None:
+                append((sprite, (x * cs, y * cs)))
+
+        tail_x, tail_y = cells[-1]
+        append((self.tail, (tail_x * cs, tail_y * cs)))
+        return blit_seq
+
+    def segment_sprite(self, index: int):
+        """
+            Спрайт сегмента с номером index (0 — голова) для текущего тела.
+
+            Спрайты головы/хвоста берутся как есть: перед вызовом должны быть
+            обновлены _update_head_graphics()/_update_tail_graphics().
+            Индексы рядом с концами тела — O(1) (deque).
+        """
+        if index == 0:
+            return self.head
+        if index == len(self.xs) - 1:
+            return self.tail
+
+        xs, ys = self.xs, self.ys
+        x, y = xs[index], ys[index]
+        return self._body_by_deltas.get(
+            (xs[index + 1] - x, ys[index + 1] - y, xs[index - 1] - x, ys[index - 1] - y)
+        )
+
+    def _update_head_graphics(self):
+        """Выбирает правильный спрайт головы по направлению движения."""
+
+        head_relation = (self.xs[1] - self.xs[0], self.ys[1] - self.ys[0])
+        self.head = self._head_by_delta.get(head_relation, self.head)
+
+    def _update_tail_graphics(self):
+        """Выбирает правильный спрайт хвоста по направлению последнего сегмента."""
+
+        tail_relation = (self.xs[-2] - self.xs[-1], self.ys[-2] - self.ys[-1])
+        self.tail = self._tail_by_delta.get(tail_relation, self.tail)
+
+
+class FreeCells:
+    """
+    Множество свободных клеток (x, y) поля cell_number x cell_number с O(1) add/discard/choice.
+
+    Клетки лежат в списке (для random.choice), а плоская таблица _slot
+    (индекс y * cell_number + x) хранит позицию клетки в списке или -1 —
+    без хэширования кортежей. Удаление — перестановкой последнего элемента
+    на место удалённого.
+    """
+
+    __slots__ = ('cell_number', '_cells', '_slot')
+
+    def __init__(self, cell_number: int, cells: Iterable[Tuple[int, int]] = ()):
+        self.cell_number = cell_number
+        self._cells: List[Tuple[int, int]] = []
+        self._slot = array('i', [-1]) * (cell_number * cell_number)
+        for cell in cells:
+            self.add(cell)
+
+    def _flat(self, cell) -> int:
+        """Индекс клетки в _slot или -1, если клетка вне поля."""
+
+        x, y = cell
+        n = self.cell_number
+        if 0 <= x < n and 0 <= y < n:
+            return y * n + x
+        return -1
+
+    def __contains__(self, cell) -> bool:
+        i = self._flat(cell)
+        return i >= 0 and self._slot[i] >= 0
+
+    def __len__(self) -> int:
+        return len(self._cells)
+
+    def __iter__(self):
+        return iter(self._cells)
+
+    def add(self, cell: Tuple[int, int]):
+        """Помечает клетку свободной (повторное добавление и клетки вне поля игнорируются)."""
+
+        i = self._flat(cell)
+        if i >= 0 and self._slot[i] < 0:
+            self._slot[i] = len(self._cells)
+            self._cells.append(cell)
+
+    def discard(self, cell: Tuple[int, int]):
+        """Помечает клетку занятой (если её не было среди свободных — ничего не делает)."""
+
+        i = self._flat(cell)
+        if i < 0:
+            return
+        pos = self._slot[i]
+        if pos < 0:
+            return
+        self._slot[i] = -1
+        last = self._cells.pop()
+        if pos < len(self._cells):
+            self._cells[pos] = last
+            self._slot[self._flat(last)] = pos
+
+    def choice(self, rng=random) -> Tuple[int, int]:
+        """
+            Возвращает случайную свободную клетку (множество не должно быть пустым).
+
+            Args:
+                rng: Источник случайности с методом choice() — модуль random
+                    или свой random.Random (например, засеянный в тестах).
+        """
+
+        return rng.choice(self._cells)
+
+
+class Fruit:
+    """Один фрукт (яблоко) с позицией pos = (x, y) в координатах клеток."""
+
+    __slots__ = ('cell_number', 'pos')
+
+    def __init__(self, cell_number: int):
+        self.cell_number = cell_number
+        self.pos = (0, 0)
+
+    def spawn(self, free_cells: FreeCells, rng=random):
+        """
+            Ставит фрукт в случайную свободную клетку.
+
+            Выбор идёт сразу среди свободных клеток, без повторных попыток
+            наугад; если свободных клеток нет — позиция не меняется.
+            rng — источник случайности (см. FreeCells.choice).
+        """
+        if not free_cells:
+            return
+        self.pos = free_cells.choice(rng)
+
+    def draw(self, screen, cell_size, apple_surface):
+        """
+            Рисует фрукт.
+        """
+        # blit принимает позицию-кортеж: Rect на каждый кадр не нужен
+        x, y = self.pos
+        screen.blit(apple_surface, (x * cell_size, y * cell_size))
+
+
+class SnakeGame:
+    """
+    Основной класс игровой логики.
+    """
+
+    __slots__ = (
+        'cell_number', 'fruits_count', 'snake', 'fruits', 'pending_spawns', 'game_over',
+        '_grass_surface', '_grass_cell_size', '_free_cells',
+        '_dirty_cells', '_full_redraw', '_ticks_since_draw', '_drawn_score', '_score_area',
+        '_rng',
+    )
+
+    def __init__(self, cell_number: int, fruits_count: int = 5, rng=None):
+        """
+            Args:
+                cell_number: Размер поля в клетках (cell_number x cell_number).
+                fruits_count: Сколько фруктов одновременно на поле (минимум 1).
+                rng: Источник случайности для спавна фруктов (random.Random);
+                    по умолчанию — модуль random.
+        """
+        self.cell_number = cell_number
+        self.fruits_count = max(1, int(fruits_count))
+        self._rng = rng
+
+        self.snake = Snake()
+        # Фрукты по клетке (x, y): O(1) проверка поедания; порядок вставки = порядок спавна
+        self.fruits: Dict[Tuple[int, int], Fruit] = {}
+        self.pending_spawns = 0
+        self.game_over = False
+
+        # Поле (фон + шахматка травы) рисуется один раз на первом draw()
+        # и пересобирается только при смене cell_size.
+        self._grass_surface = None
+        self._grass_cell_size = None
+
+        # Изменившиеся с прошлого кадра клетки для draw_dirty(); при
+        # _full_redraw следующий кадр рисуется целиком.
+        self._dirty_cells: Set[Tuple[int, int]] = set()
+        self._full_redraw = True
+        self._ticks_since_draw = 0
+        self._drawn_score = None
+        self._score_area = None
+
+        # Свободные клетки поля (не змейка и не фрукты): обновляются точечно
+        # при движении, поедании и спавне, а не пересобираются на каждый спавн.
+        self._free_cells = self._build_free_cells()
+
+        self._spawn_initial_fruits()
+
+    def reset(self):
+        """Полный сброс игрового состояния (змейка/фрукты/очки/game_over)."""
+
+        self.snake.reset()
+        self.fruits.clear()
+        self.pending_spawns = 0
+        self.game_over = False
+        self._free_cells = self._build_free_cells()
+        self._spawn_initial_fruits()
+        self.invalidate()
+
+    def invalidate(self):
+        """Помечает, что следующий draw_dirty() должен перерисовать кадр целиком."""
+
+        self._full_redraw = True
+
+    def is_game_over(self) -> bool:
+        """Возвращает True, если игра завершена (столкновение)."""
+
+        return self.game_over
+
+    def get_score(self) -> int:
+        """Возвращает текущий счёт: длина змейки минус стартовая длина (3)."""
+
+        return max(0, len(self.snake.xs) - len(START_BODY))
+
+    def update(self):
+        """
+            Один тик игры (вызывается из GameApp._update_game раз в tick_ms).
+            Порядок:
+            - движение
+            - поедание
+            - проверка проигрыша
+            - дозаспавн фруктов (не более 1 за тик)
+        """
+        if self.game_over:
+            return
+
+        moved = self.snake.move()
+        if moved is not None:
+            self._apply_move(*moved)
+            self._mark_moved(*moved)
+        self._check_eat()
+        self._check_fail()
+        self._process_pending_spawns(max_per_update=1)
+        if self.game_over:
+            self.invalidate()
+
+    def handle_key(self, key):
+        """
+            Обрабатывает направление движения по нажатой клавише.
+
+        """
+        if self.game_over:
+            return
+
+        dx, dy = self.snake.direction
+        if key == pygame.K_UP and dy != 1:
+            self.snake.direction = (0, -1)
+        elif key == pygame.K_RIGHT and dx != -1:
+            self.snake.direction = (1, 0)
+        elif key == pygame.K_DOWN and dy != -1:
+            self.snake.direction = (0, 1)
+        elif key == pygame.K_LEFT and dx != 1:
+            self.snake.direction = (-1, 0)
+
+    def draw(self, screen, cell_size, apple_surface, game_font):
+        """Рисует кадр целиком: поле, фрукты, змейку и счёт."""
+
+        self._draw_grass(screen, cell_size)
+
+        blit_batch(screen, [
+            (apple_surface, (x * cell_size, y * cell_size))
+            for x, y in self.fruits
+        ])
+
+        self.snake.draw(screen, cell_size)
+        self._score_area = self._draw_score(screen, cell_size, apple_surface, game_font)
+
+        self._dirty_cells.clear()
+        self._full_redraw = False
+        self._ticks_since_draw = 0
+        self._drawn_score = self.get_score()
+
+    def draw_dirty(self, screen, cell_size, apple_surface, game_font) -> Optional[List[pygame.Rect]]:
+        """
+            Перерисовывает только клетки, изменившиеся с прошлого кадра.
+
+            За один тик меняются лишь клетки новой головы, бывшей головы, нового
+            хвоста, освобождённого хвоста и появившегося фрукта: они заливаются
+            травой из _grass_surface и рисуются заново. Если так кадр не
+            восстановить (первый кадр, смена счёта, game_over, больше одного тика
+            с прошлого кадра, изменения под табличкой счёта) — рисует кадр целиком.
+
+            Returns:
+                Список изменённых Rect для pygame.display.update(),
+                или None, если кадр перерисован целиком (нужен flip()).
+        """
+        if (
+            self._full_redraw
+            or self._ticks_since_draw > 1
+            or self._grass_cell_size != cell_size
+            or self._drawn_score != self.get_score()
+        ):
+            self.draw(screen, cell_size, apple_surface, game_font)
+            return None
+
+        if not self._dirty_cells:
+            return []
+
+        cs = cell_size
+        cells = list(self._dirty_cells)
+        rects = [pygame.Rect(x * cs, y * cs, cs, cs) for x, y in cells]
+        if self._score_area.collidelist(rects) != -1:
+            self.draw(screen, cell_size, apple_surface, game_font)
+            return None
+
+        snake = self.snake
+        snake._update_head_graphics()
+        snake._update_tail_graphics()
+        # Спрайт могут поменять только голова, сегмент за ней и хвост
+        last = len(snake.xs) - 1
+        segment_at = {(snake.xs[i], snake.ys[i]): i for i in (0, 1, last)}
+
+        grass = self._grass_surface
+        blit_seq = []
+        for cell, rect in zip(cells, rects):
+            screen.blit(grass, rect, rect)
+            if cell in self.fruits:
+                blit_seq.append((apple_surface, rect.topleft))
+            index = segment_at.get(cell)
+            if index is not None:
+                sprite = snake.segment_sprite(index)
+                if sprite is not None:
+                    blit_seq.append((sprite, rect.topleft))
+        blit_batch(screen, blit_seq)
+
+        self._dirty_cells.clear()
+        self._ticks_since_draw = 0
+        return rects
+
+    # ---- fruits ----
+
+    def _apply_move(self, added, removed):
+        """Переносит шаг змейки в _free_cells: освобождает клетку хвоста, занимает клетку головы."""
+
+        if removed is not None:
+            self._free_cells.add(removed)
+        self._free_cells.discard(added)
+
+    def _mark_moved(self, added, removed):
+        """Отмечает для draw_dirty() клетки, которые изменил шаг змейки."""
+
+        snake = self.snake
+        dirty = self._dirty_cells
+        dirty.add(added)
+        dirty.add((snake.xs[1], snake.ys[1]))
+        dirty.add((snake.xs[-1], snake.ys[-1]))
+        if removed is not None:
+            dirty.add(removed)
+        self._ticks_since_draw += 1
+
+    def _occupied_cells(self) -> Set[Tuple[int, int]]:
+        """Собирает множество занятых клеток (змейка + фрукты) с нуля."""
+
+        occupied: Set[Tuple[int, int]] = set(zip(self.snake.xs, self.snake.ys))
+        occupied.update(self.fruits)
+        return occupied
+
+    def _build_free_cells(self) -> FreeCells:
+        """Собирает свободные клетки поля с нуля (все клетки минус занятые)."""
+
+        occupied = self._occupied_cells()
+        n = self.cell_number
+        return FreeCells(
+            n, ((x, y) for y in range(n) for x in range(n) if (x, y) not in occupied)
+        )
+
+    def _spawn_initial_fruits(self):
+        """Спавнит стартовое количество фруктов (fruits_count)."""
+
+        for _ in range(self.fruits_count):
+            self._spawn_one_fruit()
+
+    def _spawn_one_fruit(self):
+        """Создаёт 1 фрукт и ставит его в свободную клетку (если свободных клеток нет — не создаёт)."""
+
+        if not self._free_cells:
+            return
+        fruit = Fruit(self.cell_number)
+        fruit.spawn(self._free_cells, random if self._rng is None else self._rng)
+        self.fruits[fruit.pos] = fruit
+        self._free_cells.discard(fruit.pos)
+        self._dirty_cells.add(fruit.pos)
+
+    def _check_eat(self):
+        """
+                Проверяет поедание фруктов:
+                - если голова на фрукте: удалить фрукт, вырастить змейку, запланировать новый фрукт.
+        """
+        if self.fruits.pop(self.snake.head_cell(), None) is not None:
+            # Клетка съеденного фрукта остаётся занятой: теперь в ней голова.
+            self.snake.add_block()
+            self.snake.play_crunch_sound()
+            self.pending_spawns += 1
+
+    def _process_pending_spawns(self, max_per_update: int = 1):
+        if self.pending_spawns <= 0:
+            return
+
+        created = 0
+        while (
+            created < max_per_update
+            and self.pending_spawns > 0
+            and len(self.fruits) < self.fruits_count
+        ):
+            self._spawn_one_fruit()
+            self.pending_spawns -= 1
+            created += 1
+
+        if len(self.fruits) >= self.fruits_count:
+            self.pending_spawns = 0
+
+    # ---- fail ----
+
+    def _check_fail(self):
+        head = self.snake.head_cell()
+
+        if not (0 <= head[0] < self.cell_number and 0 <= head[1] < self.cell_number):
+            self.game_over = True
+            return
+
+        # Самопересечение определяет Snake.move() по множеству клеток тела — O(1)
+        if self.snake.hit_self:
+            self.game_over = True
+
+    # ---- draw helpers ----
+
+    def _draw_grass(self, screen, cell_size):
+        if self._grass_surface is None or self._grass_cell_size != cell_size:
+            self._grass_surface = self._build_grass_surface(cell_size)
+            self._grass_cell_size = cell_size
+        screen.blit(self._grass_surface, (0, 0))
+
+    def _build_grass_surface(self, cell_size):
+        """Рисует фон поля с шахматкой травы на отдельной поверхности (один раз)."""
+        size = self.cell_number * cell_size
+        surf = pygame.Surface((size, size)).convert()
+        surf.fill((175, 215, 70))
+
+        grass_color = (167, 209, 61)
+        fill = surf.fill
+        for rect in _grass_tiles(self.cell_number, cell_size):
+            fill(grass_color, rect)
+        return surf
+
+    def _draw_score(self, screen, cell_size, apple_surface, game_font):
+        score_text = str(self.get_score())
+        score_surface = game_font.render(score_text, True, (56, 74, 12))
+        score_x = int(cell_size * self.cell_number - 60)
+        score_y = int(cell_size * self.cell_number - 40)
+        score_rect = score_surface.get_rect(center=(score_x, score_y))
+        apple_rect = apple_surface.get_rect(midright=(score_rect.left, score_rect.centery))
+        bg_rect = pygame.Rect(
+            apple_rect.left,
+            apple_rect.top,
+            apple_rect.width + score_rect.width + 6,
+            apple_rect.height
+        )
+
+        pygame.draw.rect(screen, (167, 209, 61), bg_rect)
+        screen.blit(score_surface, score_rect)
+        screen.blit(apple_surface, apple_rect)
+        pygame.draw.rect(screen, (56, 74, 12), bg_rect, 2)
+        return bg_rect.union(score_rect)
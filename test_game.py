@@ -7,23 +7,33 @@ test_game.py
 - ScoreDB: сохранение/чтение last_score и best_score
 - SnakeGame: движение, рост, счёт, game_over (стены)
 - Fruit: корректный спавн в свободной клетке
+- image_cache: повторная загрузка ресурса берётся из кэша
+- SnakeGame.draw_dirty(): частичная перерисовка совпадает с полной по пикселям
 
 Тесты не открывают окно и не требуют реальных ассетов:
 - pygame.image.load и pygame.mixer.Sound подменяются заглушками.
+- Для тестов отрисовки видеодрайвер SDL — dummy: экран живёт только в памяти.
+- pygame и модули игры импортируются лениво, только классами, которым они
+  нужны: запуск одних тестов ScoreDB pygame не загружает.
 
 Запуск:
     python -m unittest -v test_game.py
 """
 
+import copy
 import os
+import random
+import sqlite3
+import threading
 import unittest
 import tempfile
-
-import pygame
-from pygame.math import Vector2
+import zlib
+from unittest import mock
 
 from score_db import ScoreDB
-from snake_game import SnakeGame
+
+# Загружаются лениво в _import_game_modules()
+pygame = image_cache = FreeCells = Fruit = SnakeGame = None
 
 
 class _DummySurface:
@@ -38,52 +48,299 @@ class _DummySound:
         return None
 
 
-def _patch_pygame_assets():
+# Направления и шаблоны тела — неизменяемые кортежи уровня модуля:
+# Snake.body копирует клетки при присваивании, поэтому шаблоны можно переиспользовать.
+_RIGHT = (1, 0)
+_UP = (0, -1)
+_DOWN = (0, 1)
+_BODY_ROW_5 = ((5, 5), (4, 5), (3, 5))
+
+# Размеры поля для проверки столкновения со стеной
+_WALL_BOARD_SIZES = (5, 10, 20, 50)
+
+# Сценарии get()/set_many(): (имя, ключ, default, записываемые по порядку значения, ожидаемое get())
+_SCOREDB_SCENARIOS = (
+    ("absent_default_zero", "last_score", 0, (), 0),          # ключа нет — default
+    ("absent_default_custom", "best_score", 123, (), 123),
+    ("set_get_last", "last_score", 0, (7,), 7),               # set() затем get()
+    ("set_get_best", "best_score", 0, (11,), 11),
+    ("upsert_overwrites", "best_score", 0, (10, 15), 15),     # повторный set() — upsert
+)
+
+
+class _FlakyConnection:
+    """
+    Прокси sqlite3.Connection для тестов ScoreDB: первые fail_commits вызовов
+    COMMIT падают с OperationalError, остальное передаётся соединению.
+
+    Если передан hold (threading.Event), BEGIN ждёт его: поток-писатель
+    держится на первой пачке (held выставляется, когда он встал), а новые
+    записи копятся в очереди одной пачкой.
+    """
+    def __init__(self, con, fail_commits=0, hold=None):
+        self._con = con
+        self.fail_commits = fail_commits
+        self.hold = hold
+        self.held = threading.Event()
+
+    def execute(self, sql, *args):
+        if sql == "BEGIN" and self.hold is not None:
+            self.held.set()
+            self.hold.wait()
+        if sql == "COMMIT" and self.fail_commits:
+            self.fail_commits -= 1
+            raise sqlite3.OperationalError("database is locked")
+        return self._con.execute(sql, *args)
+
+    def __getattr__(self, name):
+        return getattr(self._con, name)
+
+
+_DUMMY_SURFACE = _DummySurface()
+_DUMMY_SOUND = _DummySound()
+
+
+def _import_game_modules():
+    """Импортирует pygame и модули игры (один раз) и инициализирует pygame."""
+    global pygame, image_cache, FreeCells, Fruit, SnakeGame
+    # Окно не открываем: set_mode() для тестов отрисовки создаёт экран в памяти
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    import pygame
+    import image_cache
+    from snake_game import FreeCells, Fruit, SnakeGame
+
+    if not pygame.get_init():
+        pygame.init()
+
+
+def _stub_pygame_assets(test_class, load=None):
     """
-    Подменяет загрузку картинок и звуков на заглушки.
+    Подменяет загрузку картинок и звуков на заглушки на время тестов класса.
 
     Зачем:
     - тесты должны работать без файлов Graphics/* и Sound/*
     - не должен открываться video mode (окно) ради convert_alpha()
+
+    Подмена ставится через mock.patch.object и снимается после класса
+    (addClassCleanup); кэш image_cache очищается, чтобы заглушки из него
+    не достались другим тестам. Перед подменой лениво импортирует pygame.
+
+    Args:
+        load: Своя подмена pygame.image.load() (например, _solid_sprite для тестов
+            отрисовки); по умолчанию все картинки — _DUMMY_SURFACE.
     """
-    pygame.image.load = lambda *args, **kwargs: _DummySurface()
-    pygame.mixer.Sound = lambda *args, **kwargs: _DummySound()
+    _import_game_modules()
+    if load is None:
+        load = lambda *args, **kwargs: _DUMMY_SURFACE
+    for target, name, stub in (
+        (pygame.image, "load", load),
+        (pygame.mixer, "Sound", lambda *args, **kwargs: _DUMMY_SOUND),
+    ):
+        patcher = mock.patch.object(target, name, stub)
+        patcher.start()
+        test_class.addClassCleanup(patcher.stop)
+    test_class.addClassCleanup(image_cache.clear)
+
+
+def _solid_sprite(path, *args, **kwargs):
+    """
+    Заглушка pygame.image.load() для тестов отрисовки.
+
+    Каждый путь — квадрат 40x40 своего цвета (по crc32 пути) с прозрачным
+    углом: неверно выбранный спрайт или не восстановленная под спрайтом трава
+    дают отличие по пикселям.
+    """
+    crc = zlib.crc32(path.encode())
+    surf = pygame.Surface((40, 40), pygame.SRCALPHA)
+    surf.fill((crc & 0xFF, (crc >> 8) & 0xFF, (crc >> 16) & 0xFF, 255))
+    surf.fill((0, 0, 0, 0), (0, 0, 10, 10))
+    return surf
 
 
 class TestScoreDB(unittest.TestCase):
-    """Тесты слоя хранения результатов (SQLite)."""
-
-    def test_get_default_when_absent(self):
-        """Если ключа нет в БД — get() возвращает default."""
-        with tempfile.TemporaryDirectory() as tmp:
-            db_path = os.path.join(tmp, "scores.db")
-            db = ScoreDB(db_path)
+    """
+    Тесты слоя хранения результатов (SQLite).
 
-            self.assertEqual(db.get("last_score", 0), 0)
-            self.assertEqual(db.get("best_score", 123), 123)
+    Тесты логики ключ-значение работают с БД в памяти (":memory:") — без
+    временных каталогов и записи на диск. Файл нужен только тестам,
+    проверяющим сохранение между экземплярами; они открывают его с fast=True
+    (без fsync), кроме теста flush(), которому нужно второе соединение.
+    """
 
-    def test_set_and_get(self):
-        """set() сохраняет значения, get() возвращает сохранённые."""
-        with tempfile.TemporaryDirectory() as tmp:
-            db_path = os.path.join(tmp, "scores.db")
-            db = ScoreDB(db_path)
+    def setUp(self):
+        """Свежая БД в памяти на каждый тест."""
+        self.db = self.open_db(":memory:")
+
+    def open_db(self, path, **kwargs):
+        """Утилита: открывает ScoreDB и закрывает его после теста (close() идемпотентен)."""
+        db = ScoreDB(path, **kwargs)
+        self.addCleanup(db.close)
+        return db
+
+    def tmp_db_path(self):
+        """
+        Утилита (аналог tmp_path): путь к файлу БД во временном каталоге теста.
+
+        Каталог удаляется после теста — уже после закрытия открытых в нём БД,
+        так как cleanup'ы выполняются в обратном порядке.
+        """
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        return os.path.join(tmp.name, "scores.db")
+
+    def test_get_set_table(self):
+        """
+        get()/set_many() по таблице _SCOREDB_SCENARIOS на одной БД: каждая строка —
+        отдельный subTest, между строками БД очищается через clear().
+
+        Записи строки уходят одной пачкой set_many() (одна транзакция), так что
+        upsert проверяется и внутри пачки.
+        """
+        for name, key, default, writes, expected in _SCOREDB_SCENARIOS:
+            with self.subTest(name):
+                self.db.set_many((key, value) for value in writes)
+                self.assertEqual(self.db.get(key, default), expected)
+            self.db.clear()
+
+    def test_clear_removes_stored_values(self):
+        """clear() удаляет значения и из кэша, и из файла."""
+        db_path = self.tmp_db_path()
+        db = self.open_db(db_path, fast=True)
+        db.set("best_score", 8)
+        db.clear()
+        self.assertEqual(db.get("best_score", 0), 0)
+        db.close()
+
+        reopened = self.open_db(db_path, fast=True)
+        self.assertEqual(reopened.get("best_score", 0), 0)
+
+    def test_set_many(self):
+        """set_many() записывает все пары одной транзакцией (с upsert); принимает и словарь."""
+        self.db.set("best_score", 3)
+        self.db.set_many([("last_score", 5), ("best_score", 9)])
+
+        self.assertEqual(self.db.get("last_score", 0), 5)
+        self.assertEqual(self.db.get("best_score", 0), 9)
+
+        self.db.set_many({"best_score": 12})
+        self.assertEqual(self.db.get("best_score", 0), 12)
+
+    def test_values_survive_reopen(self):
+        """Значения из set() после close() (фоновая запись) читаются новым экземпляром ScoreDB."""
+        db_path = self.tmp_db_path()
+        db = self.open_db(db_path, fast=True)
+        db.set("best_score", 21)
+        db.close()
+
+        reopened = self.open_db(db_path, fast=True)
+        self.assertEqual(reopened.get("best_score", 0), 21)
+
+    def test_queued_writes_keep_order(self):
+        """Записи и clear(), накопившиеся в очереди, применяются в порядке вызова."""
+        db_path = self.tmp_db_path()
+        db = self.open_db(db_path, fast=True)
+        db.set("best_score", 1)
+        db.clear()
+        for score in range(20):
+            db.set("last_score", score)
+        db.close()
+
+        reopened = self.open_db(db_path, fast=True)
+        self.assertEqual(reopened.get("best_score", 0), 0)
+        self.assertEqual(reopened.get("last_score", 0), 19)
+
+    def test_flush_writes_before_close(self):
+        """После flush() значения уже в файле: их видит второй экземпляр, пока первый открыт."""
+        db_path = self.tmp_db_path()
+        db = self.open_db(db_path)
+        db.set("last_score", 4)
+        db.flush()
+
+        other = self.open_db(db_path)
+        self.assertEqual(other.get("last_score", 0), 4)
+        db.close()
+        db.close()  # повторный close() безопасен
+
+    def test_writer_survives_failed_batch(self):
+        """Ошибка записи пробрасывается из flush(), а фоновый поток продолжает писать."""
+        db_path = self.tmp_db_path()
+        db = self.open_db(db_path, fast=True)
+        db.set("best_score", 2 ** 63)  # не помещается в INTEGER SQLite: пачка падает
+        with self.assertRaises(OverflowError):
+            db.flush()
+
+        db.set("last_score", 5)
+        db.flush()  # ошибка пробрасывается один раз
+        db.close()
+
+        reopened = self.open_db(db_path, fast=True)
+        self.assertEqual(reopened.get("last_score", 0), 5)
+        self.assertEqual(reopened.get("best_score", 0), 0)
+
+    def test_failed_op_keeps_batch_neighbours(self):
+        """Ошибочная запись в общей пачке теряется одна: соседние записи той же пачки доходят до файла."""
+        db_path = self.tmp_db_path()
+        db = self.open_db(db_path, fast=True)
+        release = threading.Event()
+        con = db._con = _FlakyConnection(db._con, hold=release)
+
+        db.set("last_score", 1)
+        self.assertTrue(con.held.wait(5))  # писатель занят первой пачкой
+        db.set("last_score", 5)
+        db.set("best_score", 2 ** 63)  # в той же пачке: не помещается в INTEGER SQLite
+        release.set()
+        with self.assertRaises(OverflowError):
+            db.flush()
+        db.close()
+
+        reopened = self.open_db(db_path, fast=True)
+        self.assertEqual(reopened.get("last_score", 0), 5)
+        self.assertEqual(reopened.get("best_score", 0), 0)
+
+    def test_writer_survives_failed_commit(self):
+        """Упавший COMMIT откатывается: ошибка уходит в flush(), следующие записи доходят до файла."""
+        db_path = self.tmp_db_path()
+        db = self.open_db(db_path, fast=True)
+        db._con = _FlakyConnection(db._con, fail_commits=1)
+
+        db.set("best_score", 3)
+        with self.assertRaises(sqlite3.OperationalError):
+            db.flush()
+
+        db.set("last_score", 5)
+        db.flush()
+        db.close()
+
+        reopened = self.open_db(db_path, fast=True)
+        self.assertEqual(reopened.get("last_score", 0), 5)
+        self.assertEqual(reopened.get("best_score", 0), 0)
+
+
+class TestImageCache(unittest.TestCase):
+    """Тесты кэша ресурсов image_cache."""
 
-            db.set("last_score", 7)
-            db.set("best_score", 11)
+    @classmethod
+    def setUpClass(cls):
+        """Заглушки ассетов — только на время тестов класса."""
+        _stub_pygame_assets(cls)
 
-            self.assertEqual(db.get("last_score", 0), 7)
-            self.assertEqual(db.get("best_score", 0), 11)
+    def test_load_returns_same_surface(self):
+        """Повторный load() по тому же пути берёт объект из кэша, а не грузит файл снова."""
+        with mock.patch.object(pygame.image, "load", side_effect=lambda *a, **k: _DummySurface()) as load:
+            first = image_cache.load("photos/__test_cache__.png")
+            second = image_cache.load("photos/__test_cache__.png")
 
-    def test_upsert_overwrites(self):
-        """Повторный set() по тому же ключу должен обновлять значение (upsert)."""
-        with tempfile.TemporaryDirectory() as tmp:
-            db_path = os.path.join(tmp, "scores.db")
-            db = ScoreDB(db_path)
+        self.assertIs(first, second)
+        load.assert_called_once()
 
-            db.set("best_score", 10)
-            db.set("best_score", 15)
+    def test_load_sound_returns_same_sound(self):
+        """Повторный load_sound() по тому же пути берёт звук из кэша, а не создаёт заново."""
+        with mock.patch.object(pygame.mixer, "Sound", side_effect=lambda *a, **k: _DummySound()) as sound:
+            first = image_cache.load_sound("Sound/__test_cache__.wav")
+            second = image_cache.load_sound("Sound/__test_cache__.wav")
 
-            self.assertEqual(db.get("best_score", 0), 15)
+        self.assertIs(first, second)
+        sound.assert_called_once()
 
 
 class TestSnakeGameCore(unittest.TestCase):
@@ -91,45 +348,70 @@ class TestSnakeGameCore(unittest.TestCase):
 
     @classmethod
     def setUpClass(cls):
-        """Единожды инициализируем pygame и ставим заглушки ассетов."""
-        pygame.init()
-        _patch_pygame_assets()
+        """Импортируем pygame и ставим заглушки ассетов на время тестов класса."""
+        _stub_pygame_assets(cls)
+        # Эталонные игры по (n, fruits): конструктор вызывается один раз на пару
+        cls._prototypes = {}
+        # Свой засеянный RNG для спавна: не трогает глобальный random
+        cls._rng = random.Random(0)
+        # Общая игра 10x10 для простых тестов: между тестами только reset()
+        cls._shared = SnakeGame(cell_number=10, fruits_count=1, rng=cls._rng)
+
+    def shared_game(self):
+        """
+        Утилита: возвращает общую для класса игру 10x10 после reset().
+
+        reset() дешевле конструктора; RNG игры сидится заново, чтобы спавн
+        фруктов не зависел от порядка тестов.
+        """
+        self._rng.seed(0)
+        self._shared.reset()
+        return self._shared
 
     def make_game(self, n=10, fruits=1):
-        """Утилита: создаёт игру с заданным размером поля и кол-вом фруктов."""
-        g = SnakeGame(cell_number=n, fruits_count=fruits)
-        g.reset()
-        return g
+        """
+        Утилита: возвращает игру с заданным размером поля и кол-вом фруктов.
+
+        Каждый тест получает глубокую копию эталонной игры после reset(),
+        так что изменения в одном тесте не видны в других.
+        """
+        key = (n, fruits)
+        proto = self._prototypes.get(key)
+        if proto is None:
+            proto = SnakeGame(cell_number=n, fruits_count=fruits)
+            proto.reset()
+            self._prototypes[key] = proto
+        return copy.deepcopy(proto)
 
     def test_initial_state_not_game_over(self):
         """После reset() игра не должна быть в состоянии game_over и счёт = 0."""
-        g = self.make_game()
+        g = self.shared_game()
         self.assertFalse(g.is_game_over())
         self.assertEqual(g.get_score(), 0)
 
     def test_no_move_when_direction_zero(self):
         """Если направление (0,0), update() не должен двигать змейку."""
-        g = self.make_game()
-        start_head = g.snake.body[0].copy()
+        g = self.shared_game()
+        start_head = g.snake.head_cell()
 
         g.update()
 
-        self.assertEqual(g.snake.body[0], start_head)
+        self.assertEqual(g.snake.head_cell(), start_head)
 
     def test_move_one_step_changes_head(self):
         """При направлении вправо голова должна сдвинуться на +1 по X за один update()."""
-        g = self.make_game()
-        g.snake.direction = Vector2(1, 0)
-        start_head = g.snake.body[0].copy()
+        g = self.shared_game()
+        g.snake.direction = _RIGHT
+        start_head = g.snake.head_cell()
 
         g.update()
 
-        self.assertEqual(g.snake.body[0], start_head + Vector2(1, 0))
+        self.assertEqual(g.snake.head_cell(), (start_head[0] + 1, start_head[1]))
 
     def test_add_block_grows_on_next_move(self):
         """После add_block() длина должна увеличиться на 1 на следующем update()."""
-        g = self.make_game()
-        g.snake.direction = Vector2(1, 0)
+        g = self.shared_game()
+        g.snake.direction = _RIGHT
 
         start_len = len(g.snake.body)
         g.snake.add_block()
@@ -138,28 +420,195 @@ class TestSnakeGameCore(unittest.TestCase):
         self.assertEqual(len(g.snake.body), start_len + 1)
         self.assertEqual(g.get_score(), 1)
 
+    def test_move_drops_tail_and_keeps_length(self):
+        """Без роста шаг добавляет голову и снимает хвост: длина не меняется, тело сдвигается."""
+        g = self.make_game()
+        g.fruits.clear()  # фрукт на пути вызвал бы рост
+        g.snake.body = _BODY_ROW_5
+        g.snake.direction = _DOWN
+
+        g.update()
+        g.update()
+
+        self.assertEqual(g.snake.body, [(5, 7), (5, 6), (5, 5)])
+
     def test_wall_collision_sets_game_over(self):
-        """Выход головы за границы поля должен выставлять game_over=True."""
-        g = self.make_game(n=5, fruits=1)
+        """Выход головы за границы поля должен выставлять game_over=True (на полях разного размера)."""
+        for n in _WALL_BOARD_SIZES:
+            with self.subTest(n=n):
+                g = self.make_game(n=n, fruits=1)
+
+                # Голова на правой границе, шаг вправо => выход за поле
+                g.snake.body = tuple((x, 2) for x in range(n - 1, n - 4, -1))
+                g.snake.direction = _RIGHT
 
-        # Голова на правой границе, шаг вправо => выход за поле
-        g.snake.body = [Vector2(4, 2), Vector2(3, 2), Vector2(2, 2)]
-        g.snake.direction = Vector2(1, 0)
+                g.update()
+
+                self.assertTrue(g.is_game_over())
+
+    def test_self_collision_sets_game_over(self):
+        """Шаг головы в клетку собственного тела должен выставлять game_over=True."""
+        g = self.make_game(n=10, fruits=1)
+
+        # Змейка свёрнута петлёй: шаг вверх ведёт голову на сегмент тела
+        g.snake.body = ((3, 3), (4, 3), (4, 2), (3, 2), (2, 2))
+        g.snake.direction = _UP
 
         g.update()
 
         self.assertTrue(g.is_game_over())
 
+    def test_step_into_vacated_tail_is_not_collision(self):
+        """Шаг головы в клетку, которую на этом же шаге освобождает хвост, не считается столкновением."""
+        g = self.make_game(n=10, fruits=1)
+        g.fruits.clear()
+
+        # Квадрат 2x2: голова (3,3), хвост (3,2); шаг вверх ведёт голову в клетку хвоста
+        g.snake.body = ((3, 3), (4, 3), (4, 2), (3, 2))
+        g.snake.direction = _UP
+
+        g.update()
+
+        self.assertFalse(g.is_game_over())
+        self.assertEqual(g.snake.body, [(3, 2), (3, 3), (4, 3), (4, 2)])
+
+    def test_eating_fruit_grows_and_respawns(self):
+        """Голова на клетке фрукта: фрукт съеден, змейка растёт, на его место спавнится новый."""
+        g = self.make_game(n=10, fruits=1)
+        fruit = Fruit(10)
+        fruit.spawn(FreeCells(10, [(6, 9)]))
+        g.fruits.clear()
+        g.fruits[(6, 9)] = fruit  # ключ словаря — клетка фрукта
+        g.snake.body = ((5, 9), (4, 9), (3, 9))
+        g.snake.direction = _RIGHT
+
+        g.update()
+        g.update()
+
+        self.assertNotIn((6, 9), g.fruits)
+        self.assertEqual(len(g.fruits), 1)
+        self.assertEqual(g.get_score(), 1)
+
+    def test_seeded_rng_makes_spawns_reproducible(self):
+        """Игры с одинаково засеянным rng расставляют фрукты в одни и те же клетки."""
+        first = SnakeGame(cell_number=10, fruits_count=5, rng=random.Random(42))
+        second = SnakeGame(cell_number=10, fruits_count=5, rng=random.Random(42))
+
+        self.assertEqual(list(first.fruits), list(second.fruits))
+
+    def test_spawn_fills_last_free_cell(self):
+        """Если свободна ровно одна клетка, spawn() ставит фрукт именно туда."""
+        fruit = Fruit(10)
+
+        fruit.spawn(FreeCells(10, [(7, 3)]))
+
+        self.assertEqual(fruit.pos, (7, 3))
+
+    def test_free_cells_add_discard(self):
+        """FreeCells: discard() убирает клетку, add() возвращает; клетки вне поля игнорируются."""
+        free = FreeCells(3, [(0, 0), (1, 0), (2, 2)])
+
+        free.discard((0, 0))
+        free.discard((5, 5))
+        free.add((-1, 0))
+        free.add((1, 1))
+
+        self.assertNotIn((0, 0), free)
+        self.assertNotIn((-1, 0), free)
+        self.assertEqual(set(free), {(1, 0), (2, 2), (1, 1)})
+
+    def test_free_cells_tracked_incrementally(self):
+        """Точечно обновляемые _free_cells совпадают с пересборкой с нуля после шагов и поеданий."""
+        g = self.make_game(n=20, fruits=5)
+        g.snake.direction = _RIGHT
+
+        for step in range(10):
+            if step % 2:
+                g.snake.add_block()  # шаг с ростом: хвост не освобождается
+            g.update()
+            self.assertEqual(set(g._free_cells), set(g._build_free_cells()))
+
     def test_spawned_fruit_not_on_snake(self):
         """Fruit.spawn() не должен ставить фрукт на клетку, занятую змейкой."""
-        g = self.make_game(n=10, fruits=1)
+        n = 10
+        g = self.make_game(n=n, fruits=1)
+        g.snake.body = ((1, 1), (1, 2), (1, 3), (1, 4))
 
-        g.snake.body = [Vector2(1, 1), Vector2(1, 2), Vector2(1, 3), Vector2(1, 4)]
-        occupied = {(int(b.x), int(b.y)) for b in g.snake.body}
+        # Занятые клетки — frozenset, собранный один раз
+        occupied = frozenset(g.snake.body)
+        free = FreeCells(n, ((x, y) for y in range(n) for x in range(n) if (x, y) not in occupied))
 
-        g.fruits[0].spawn(occupied)
+        fruit = Fruit(n)
+        spawned = []
+        for _ in range(1000):
+            fruit.spawn(free, self._rng)
+            spawned.append(fruit.pos)
 
-        self.assertNotIn((int(g.fruits[0].pos.x), int(g.fruits[0].pos.y)), occupied)
+        # Одна проверка на все позиции сразу (пересечение множеств на C), а не assert на каждый спавн
+        self.assertTrue(occupied.isdisjoint(spawned))
+
+
+class TestDirtyRedraw(unittest.TestCase):
+    """Частичная перерисовка draw_dirty() против полного draw() — по пикселям, без окна."""
+
+    CELL_SIZE = 40
+    N = 15
+
+    @classmethod
+    def setUpClass(cls):
+        """Настоящие поверхности вместо заглушек: экран dummy-драйвера и цветные спрайты."""
+        _stub_pygame_assets(cls, load=_solid_sprite)
+
+        size = cls.N * cls.CELL_SIZE
+        cls.screen = pygame.display.set_mode((size, size))
+        cls.addClassCleanup(pygame.display.quit)
+        cls.apple = _solid_sprite("Graphics/apple.png").convert_alpha()
+        cls.font = pygame.font.Font(None, 25)
+
+    def full_frame(self, game):
+        """Утилита: эталонный кадр — полный draw() на отдельной поверхности."""
+        ref = pygame.Surface(self.screen.get_size()).convert()
+        game.draw(ref, self.CELL_SIZE, self.apple, self.font)
+        return pygame.image.tobytes(ref, "RGB")
+
+    def test_dirty_frames_match_full_redraw(self):
+        """
+        Несколько тиков (с поеданием и поворотом): после каждого кадр draw_dirty()
+        совпадает с полным draw(), а возвращённые Rect покрывают все изменённые пиксели.
+        """
+        g = SnakeGame(cell_number=self.N, fruits_count=3, rng=random.Random(0))
+        g.fruits.clear()
+        fruit = Fruit(self.N)
+        fruit.pos = (7, 10)
+        g.fruits[fruit.pos] = fruit  # на пути змейки: съедается на втором тике
+        g.snake.direction = _RIGHT
+        cs = self.CELL_SIZE
+        self.assertIsNone(g.draw_dirty(self.screen, cs, self.apple, self.font))
+
+        # Вправо: шаг, поедание (7, 10), рост; затем поворот вверх и влево
+        turns = {3: pygame.K_UP, 5: pygame.K_LEFT}
+        partial_frames = 0
+        for tick in range(7):
+            if tick in turns:
+                g.handle_key(turns[tick])
+            g.update()
+            self.assertFalse(g.is_game_over())
+
+            before = self.screen.copy()
+            rects = g.draw_dirty(self.screen, cs, self.apple, self.font)
+            after = pygame.image.tobytes(self.screen, "RGB")
+
+            with self.subTest(tick=tick):
+                self.assertEqual(after, self.full_frame(g))
+                if rects is not None:
+                    partial_frames += 1
+                    # Перенос только rects из нового кадра в старый должен дать новый кадр
+                    for rect in rects:
+                        before.blit(self.screen, rect, rect)
+                    self.assertEqual(pygame.image.tobytes(before, "RGB"), after)
+
+        self.assertEqual(g.get_score(), 1)
+        self.assertGreater(partial_frames, 0)
 
 
 if __name__ == "__main__":